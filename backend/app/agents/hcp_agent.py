@@ -2,21 +2,53 @@
 LangGraph Agent for HCP Interaction Management
 Orchestrates 5 tools: log, edit, schedule, insights, validate
 """
-from typing import TypedDict, List, Literal
+import asyncio
+import logging
+import re
+from operator import itemgetter
+from typing import TypedDict, ClassVar, Optional, Dict, Callable
 from langgraph.graph import StateGraph, END
-from app.utils.llm_utils import llm
-from app.agents.tools.log_interaction import log_interaction
-from app.agents.tools.edit_interaction import edit_interaction
-from app.agents.tools.schedule_followup import schedule_followup
-from app.agents.tools.extract_insights import extract_insights
-from app.agents.tools.validate_hcp import validate_hcp
-import json
+from langgraph.graph.graph import CompiledGraph
+from app.config import get_settings
+from app.utils.intent_cache import intent_cache
+from app.agents.tools.classify_and_extract import classify_and_extract
+from app.agents.tools.log_interaction import log_interaction, apply_log_defaults
+from app.agents.tools.edit_interaction import edit_interaction, apply_changes
+from app.agents.tools.schedule_followup import schedule_followup, fastpath_followup
+from app.agents.tools.extract_insights import (
+    extract_insights, empty_insights, build_insights_prompt, finalize_insights, INSIGHTS_MAX_TOKENS
+)
+from app.agents.tools.validate_hcp import (
+    validate_hcp, build_validation_prompt, cached_validation, finalize_validation,
+    VALIDATE_MAX_TOKENS
+)
+from app.utils.llm_utils import get_llm
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+# Maps free-form LLM output to an intent label in a single scan
+_INTENT_RE = re.compile(
+    r"(?P<log>log)"
+    r"|(?P<edit>edit|update|change)"
+    r"|(?P<schedule>schedule|follow)"
+    r"|(?P<insights>insight|analyz|opportun)"
+    r"|(?P<validate>validat|verify|check)"
+)
 
 
 class AgentState(TypedDict):
-    """State that flows through the graph."""
+    """
+    State that flows through the graph.
+    
+    Every field has overwrite semantics (no reducer annotations), so
+    LangGraph does no per-node merge work.
+    """
     user_input: str
     current_form_data: dict
+    current_snapshot: dict  # Per-request copy of current_form_data, safe to mutate
+    extraction: Optional[dict]  # Log/edit fields from the router call, None if unavailable
     form_data: dict
     tool_results: dict
     intent: str
@@ -24,6 +56,101 @@ class AgentState(TypedDict):
     error: str
 
 
+def _fmt_log(form_data: dict, tool_results: dict) -> str:
+    """Chat response for a logged interaction."""
+    parts = [
+        f"✓ I've logged your interaction with {form_data.get('hcp_name', 'the HCP')}.\n\n",
+        "📋 Details captured:\n",
+        f"- Date: {form_data.get('date', 'N/A')}\n",
+        f"- Sentiment: {form_data.get('sentiment', 'neutral')}\n"
+    ]
+    if form_data.get("materials_shared"):
+        parts.append(f"- Materials: {', '.join(form_data['materials_shared'])}\n")
+    if form_data.get("products_discussed"):
+        parts.append(f"- Products: {', '.join(form_data['products_discussed'])}\n")
+    parts.append("\nYour interaction has been recorded successfully!")
+    return "".join(parts)
+
+
+def _fmt_edit(form_data: dict, tool_results: dict) -> str:
+    """Chat response for an edited interaction."""
+    return "".join([
+        "✓ I've updated the interaction with your changes.\n\n",
+        "📝 Current data:\n",
+        f"- HCP: {form_data.get('hcp_name', 'N/A')}\n",
+        f"- Sentiment: {form_data.get('sentiment', 'N/A')}\n",
+        "The form has been updated."
+    ])
+
+
+def _fmt_schedule(form_data: dict, tool_results: dict) -> str:
+    """Chat response for a scheduled follow-up."""
+    parts = [f"✓ Follow-up scheduled for {tool_results.get('follow_up_date', 'soon')}!\n\n"]
+    talking_points = tool_results.get("talking_points", [])
+    if talking_points:
+        parts.append("📅 Talking points:\n")
+        parts.extend(f"  • {point}\n" for point in talking_points)
+    prep = tool_results.get("preparation_notes")
+    if prep:
+        parts.append(f"\n📌 Preparation: {prep}")
+    return "".join(parts)
+
+
+def _fmt_insights(form_data: dict, tool_results: dict) -> str:
+    """Chat response for extracted insights."""
+    parts = [f"🔍 Analysis complete! Priority: {tool_results.get('priority_level', 'Medium')}\n\n"]
+    opportunities = tool_results.get("opportunities", [])
+    if opportunities:
+        parts.append("✨ Opportunities:\n")
+        parts.extend(f"  • {opp}\n" for opp in opportunities)
+    actions = tool_results.get("recommended_actions", [])
+    if actions:
+        parts.append("\n🎯 Recommended actions:\n")
+        parts.extend(f"  • {action}\n" for action in actions)
+    # The validation is only reported here; the name is changed by the validate intent
+    validation = tool_results.get("validation", {})
+    if validation.get("success") and "error" not in validation:
+        parts.append(
+            f"\n👨‍⚕️ HCP check: {validation.get('formatted_name', 'Unknown')}"
+            f" ({validation.get('likely_specialty', 'Unknown')})\n"
+        )
+    if validation.get("requires_verification"):
+        parts.append("\n⚠️ HCP details need manual verification.")
+    return "".join(parts)
+
+
+def _fmt_validate(form_data: dict, tool_results: dict) -> str:
+    """Chat response for a validated HCP."""
+    parts = [
+        "✓ HCP information validated!\n\n",
+        f"👨‍⚕️ Name: {tool_results.get('formatted_name', 'Unknown')}\n",
+        f"🏥 Likely specialty: {tool_results.get('likely_specialty', 'Unknown')}\n"
+    ]
+    if tool_results.get("requires_verification"):
+        parts.append("\n⚠️ Manual verification recommended.")
+    return "".join(parts)
+
+
+def _fmt_default(form_data: dict, tool_results: dict) -> str:
+    """Chat response for any other intent."""
+    return "✓ Request processed successfully!"
+
+
+# Intent → response formatter, built once at import
+_FORMATTERS: Dict[str, Callable[[dict, dict], str]] = {
+    "log": _fmt_log,
+    "edit": _fmt_edit,
+    "schedule": _fmt_schedule,
+    "insights": _fmt_insights,
+    "validate": _fmt_validate,
+}
+
+
+def _route_after_tool(state: AgentState) -> str:
+    """Send failed tool runs to the error formatter."""
+    return "error" if state.get("error") else "formatter"
+
+
 class HCPAgent:
     """
     LangGraph agent that manages HCP interactions.
@@ -34,14 +161,25 @@ class HCPAgent:
     3. Tool node → Updates form_data
     4. Formatter → Creates friendly response
     5. Return form_data + chat_response
+    
+    The "insights" intent runs extract_insights and validate_hcp in one
+    batched LLM call (enrich_parallel node). The router extracts log/edit data
+    in the same LLM call that classifies the intent.
+    
+    The compiled graph is built once and shared by all instances; nodes
+    keep no per-instance state.
     """
     
+    _COMPILED_GRAPH: ClassVar[Optional[CompiledGraph]] = None
+    
     def __init__(self):
-        """Initialize the agent and build the graph."""
-        self.graph = self._build_graph()
-        print("✅ HCP Agent initialized with 5 tools")
+        """Initialize the agent, building the graph on first use."""
+        if HCPAgent._COMPILED_GRAPH is None:
+            HCPAgent._COMPILED_GRAPH = self._build_graph()
+        self.graph = HCPAgent._COMPILED_GRAPH
+        logger.debug("✅ HCP Agent initialized with 5 tools")
     
-    def _build_graph(self) -> StateGraph:
+    def _build_graph(self) -> CompiledGraph:
         """Build the LangGraph state graph."""
         
         # Create the graph
@@ -52,40 +190,57 @@ class HCPAgent:
         workflow.add_node("log_interaction", self._log_interaction_node)
         workflow.add_node("edit_interaction", self._edit_interaction_node)
         workflow.add_node("schedule_followup", self._schedule_followup_node)
-        workflow.add_node("extract_insights", self._extract_insights_node)
+        workflow.add_node("enrich_parallel", self._enrich_parallel_node)
         workflow.add_node("validate_hcp", self._validate_hcp_node)
         workflow.add_node("formatter", self._formatter_node)
+        workflow.add_node("error_formatter", self._error_formatter_node)
         
         # Set entry point
         workflow.set_entry_point("router")
         
         # Add conditional edges from router to tool nodes
+        # (the router always sets intent, so routing is a plain key lookup)
         workflow.add_conditional_edges(
             "router",
-            self._route_to_tool,
+            itemgetter("intent"),
             {
                 "log": "log_interaction",
                 "edit": "edit_interaction",
                 "schedule": "schedule_followup",
-                "insights": "extract_insights",
+                "insights": "enrich_parallel",
                 "validate": "validate_hcp",
-                "error": "formatter"
+                "error": "error_formatter"
             }
         )
         
-        # All tool nodes go to formatter
-        workflow.add_edge("log_interaction", "formatter")
-        workflow.add_edge("edit_interaction", "formatter")
-        workflow.add_edge("schedule_followup", "formatter")
-        workflow.add_edge("extract_insights", "formatter")
-        workflow.add_edge("validate_hcp", "formatter")
-        
-        # Formatter ends the workflow
+        # Tool nodes go to formatter, or straight to error_formatter on failure
+        for tool_node in (
+            "log_interaction",
+            "edit_interaction",
+            "schedule_followup",
+            "enrich_parallel",
+            "validate_hcp"
+        ):
+            workflow.add_conditional_edges(
+                tool_node,
+                _route_after_tool,
+                {"error": "error_formatter", "formatter": "formatter"}
+            )
+        
+        # Formatters end the workflow
         workflow.add_edge("formatter", END)
+        workflow.add_edge("error_formatter", END)
+        
+        # Requests are stateless, so no checkpointer by default; an in-memory
+        # one can be enabled for multi-turn flows that resume a thread
+        checkpointer = None
+        if settings.AGENT_CHECKPOINTING:
+            from langgraph.checkpoint.memory import MemorySaver
+            checkpointer = MemorySaver()
         
-        return workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
     
-    def _router_node(self, state: AgentState) -> AgentState:
+    async def _router_node(self, state: AgentState) -> AgentState:
         """
         Router node: Classifies user intent.
         
@@ -94,76 +249,59 @@ class HCPAgent:
         user_input = state["user_input"]
         has_existing_data = state.get("current_form_data") and state["current_form_data"].get("hcp_name")
         
-        prompt = f"""You are an intent classifier for a medical sales CRM system.
-
-User message: "{user_input}"
-
-Existing data present: {"Yes" if has_existing_data else "No"}
-
-Classify the user's intent into ONE of these categories:
-
-1. "log" - User wants to LOG a new interaction
-   - Examples: "I met with Dr. Smith", "Today's meeting was positive", "Just had a call with..."
-   - Use when: Creating NEW interaction from scratch
-
-2. "edit" - User wants to EDIT/CORRECT existing data
-   - Examples: "Actually the name was...", "Change sentiment to...", "Sorry, I meant..."
-   - Use when: Correcting or updating previously entered information
-   - IMPORTANT: Only use if existing data is present
-
-3. "schedule" - User wants to SCHEDULE a follow-up
-   - Examples: "Schedule follow-up next week", "Book a meeting with...", "Plan next visit..."
-   - Use when: Explicitly scheduling future meetings
-
-4. "insights" - User wants ANALYSIS/INSIGHTS
-   - Examples: "What are the opportunities?", "Analyze this interaction", "Give me insights..."
-   - Use when: Requesting AI analysis of interaction
-
-5. "validate" - User wants to VALIDATE HCP information
-   - Examples: "Is Dr. Smith's name correct?", "Verify this doctor", "Check HCP details..."
-   - Use when: Validating or checking HCP information
-
-Return ONLY the intent name, nothing else: log, edit, schedule, insights, or validate
-"""
+        # Single copy of the current form shared by the tool nodes
+        state["current_snapshot"] = dict(state.get("current_form_data") or {})
+        
+        # Semantic cache: paraphrases of a seen message skip the LLM call
+        embedding = None
+        if intent_cache.enabled:
+            try:
+                embedding = await self._run_tool(intent_cache.embed, user_input)
+                cached_intent = intent_cache.lookup(embedding, bool(has_existing_data))
+                if cached_intent:
+                    state["intent"] = cached_intent
+                    logger.debug("🔀 Router: Cached intent '%s'", cached_intent)
+                    return state
+            except Exception as e:
+                logger.warning("⚠️ Intent cache unavailable: %s", e)
+                embedding = None
         
         try:
-            intent = llm.call_llm(prompt, temperature=0.1, max_tokens=20).strip().lower()
+            current_data = state["current_form_data"] if has_existing_data else None
+            result = await self._run_tool(classify_and_extract, user_input, current_data)
+            intent = result["intent"].strip().lower()
             
-            # Normalize response
-            if "log" in intent:
-                intent = "log"
-            elif "edit" in intent or "update" in intent or "change" in intent:
-                intent = "edit"
-            elif "schedule" in intent or "follow" in intent:
-                intent = "schedule"
-            elif "insight" in intent or "analyz" in intent or "opportun" in intent:
-                intent = "insights"
-            elif "validat" in intent or "verify" in intent or "check" in intent:
-                intent = "validate"
-            else:
-                # Default to log for new interactions, edit if data exists
-                intent = "edit" if has_existing_data else "log"
+            # Safety net for stray output; default to log for new interactions, edit if data exists
+            match = _INTENT_RE.search(intent)
+            intent = match.lastgroup if match else ("edit" if has_existing_data else "log")
             
             state["intent"] = intent
-            print(f"🔀 Router: Classified intent as '{intent}'")
+            state["extraction"] = result["extraction"] if intent in ("log", "edit") else None
+            logger.debug("🔀 Router: Classified intent as '%s'", intent)
+            
+            # Only intents that need no extraction are cached: a cache hit
+            # can't supply the log/edit fields of a new message
+            if embedding is not None and intent not in ("log", "edit"):
+                await self._run_tool(intent_cache.add, embedding, bool(has_existing_data), intent)
             
         except Exception as e:
-            print(f"❌ Router error: {e}")
+            logger.error("❌ Router error: %s", e)
             state["intent"] = "error"
             state["error"] = str(e)
         
         return state
     
-    def _route_to_tool(self, state: AgentState) -> str:
-        """Return the next node based on intent."""
-        return state.get("intent", "log")
-    
-    def _log_interaction_node(self, state: AgentState) -> AgentState:
+    async def _log_interaction_node(self, state: AgentState) -> AgentState:
         """Log new interaction using Tool #1."""
-        print("🔧 Running: log_interaction tool")
+        logger.debug("🔧 Running: log_interaction tool")
         
         try:
-            result = log_interaction(state["user_input"])
+            # Reuse the router's extraction when available (no second LLM call)
+            extraction = state.get("extraction")
+            if extraction is not None:
+                result = apply_log_defaults(extraction)
+            else:
+                result = await self._run_tool(log_interaction, state["user_input"])
             state["tool_results"] = result
             
             if result.get("success"):
@@ -181,18 +319,23 @@ Return ONLY the intent name, nothing else: log, edit, schedule, insights, or val
                 state["error"] = result.get("error", "Unknown error")
                 
         except Exception as e:
-            print(f"❌ Error in log_interaction_node: {e}")
+            logger.error("❌ Error in log_interaction_node: %s", e)
             state["error"] = str(e)
         
         return state
     
-    def _edit_interaction_node(self, state: AgentState) -> AgentState:
+    async def _edit_interaction_node(self, state: AgentState) -> AgentState:
         """Edit existing interaction using Tool #2."""
-        print("🔧 Running: edit_interaction tool")
+        logger.debug("🔧 Running: edit_interaction tool")
         
         try:
             current_data = state.get("current_form_data", {})
-            result = edit_interaction(current_data, state["user_input"])
+            # Reuse the router's extraction when available (no second LLM call)
+            extraction = state.get("extraction")
+            if extraction is not None:
+                result = apply_changes(current_data, extraction)
+            else:
+                result = await self._run_tool(edit_interaction, current_data, state["user_input"])
             state["tool_results"] = result
             
             if result.get("success"):
@@ -202,51 +345,104 @@ Return ONLY the intent name, nothing else: log, edit, schedule, insights, or val
                 state["form_data"] = current_data  # Keep original on error
                 
         except Exception as e:
-            print(f"❌ Error in edit_interaction_node: {e}")
+            logger.error("❌ Error in edit_interaction_node: %s", e)
             state["error"] = str(e)
             state["form_data"] = state.get("current_form_data", {})
         
         return state
     
-    def _schedule_followup_node(self, state: AgentState) -> AgentState:
-        """Schedule follow-up using Tool #3."""
-        print("🔧 Running: schedule_followup tool")
+    async def _schedule_followup_node(self, state: AgentState) -> AgentState:
+        """
+        Schedule follow-up using Tool #3.
+        
+        Simple requests ("schedule a follow-up next week to discuss X")
+        skip the LLM via the fast path.
+        """
+        logger.debug("🔧 Running: schedule_followup tool")
         
         try:
             # Get HCP name from current data or extract from message
-            hcp_name = state.get("current_form_data", {}).get("hcp_name", "HCP")
-            result = schedule_followup(hcp_name, state["user_input"])
+            hcp_name = state.get("current_form_data", {}).get("hcp_name", "") or "HCP"
+            result = fastpath_followup(hcp_name, state["user_input"])
+            if result is None:
+                result = await self._run_tool(schedule_followup, hcp_name, state["user_input"])
+            
             state["tool_results"] = result
             
             if result.get("success"):
                 # Merge with existing data
-                form_data = state.get("current_form_data", {}).copy()
+                form_data = state["current_snapshot"]
                 form_data["follow_up_date"] = result.get("follow_up_date")
                 
                 # Store talking points in key_insights
                 talking_points = result.get("talking_points", [])
                 prep_notes = result.get("preparation_notes", "")
-                insights = f"Follow-up planned:\n- {chr(10).join(talking_points)}\n\nPreparation: {prep_notes}"
-                form_data["key_insights"] = insights
+                lines = ["Follow-up planned:"]
+                lines.extend("- " + point for point in talking_points)
+                lines.append("")
+                lines.append(f"Preparation: {prep_notes}")
+                form_data["key_insights"] = "\n".join(lines)
                 
                 state["form_data"] = form_data
             else:
                 state["error"] = result.get("error", "Unknown error")
                 
         except Exception as e:
-            print(f"❌ Error in schedule_followup_node: {e}")
+            logger.error("❌ Error in schedule_followup_node: %s", e)
             state["error"] = str(e)
         
         return state
     
-    def _extract_insights_node(self, state: AgentState) -> AgentState:
-        """Extract insights using Tool #4."""
-        print("🔧 Running: extract_insights tool")
+    async def _run_tool(self, func, *args, **kwargs):
+        """
+        Run a tool call.
+        
+        Async tools are awaited directly; blocking ones run in a worker thread.
+        """
+        if asyncio.iscoroutinefunction(func):
+            return await func(*args, **kwargs)
+        return await asyncio.to_thread(func, *args, **kwargs)
+    
+    async def _enrich_parallel_node(self, state: AgentState) -> AgentState:
+        """
+        Extract insights (Tool #4) and validate the HCP (Tool #5) together.
+        
+        Both tools only read current_form_data. When both need the LLM,
+        their prompts are answered by one batched call; otherwise the one
+        that still needs it runs on its own.
+        """
+        logger.debug("🔧 Running: extract_insights + validate_hcp tools (batched)")
         
         try:
             interaction_data = state.get("current_form_data", {})
-            result = extract_insights(interaction_data)
-            state["tool_results"] = result
+            hcp_name = interaction_data.get("hcp_name", "")
+            validation = await self._run_tool(cached_validation, hcp_name) if hcp_name else {}
+            result = empty_insights(interaction_data)
+            
+            if result is None and validation is None:
+                # Insights and validation with one batched LLM call (temperature 0,
+                # as the validation answer is cached like validate_hcp's)
+                insights_system, insights_prompt = build_insights_prompt(interaction_data)
+                validation_system, validation_prompt = build_validation_prompt(hcp_name)
+                insights_raw, validation_raw = await self._run_tool(
+                    get_llm().abatch_extract_json,
+                    [
+                        {"name": "extract_insights", "system": insights_system, "prompt": insights_prompt},
+                        {"name": "validate_hcp", "system": validation_system, "prompt": validation_prompt}
+                    ],
+                    temperature=0,
+                    max_tokens=INSIGHTS_MAX_TOKENS + VALIDATE_MAX_TOKENS
+                )
+                result = finalize_insights(insights_raw, interaction_data)
+                validation = await self._run_tool(finalize_validation, validation_raw, hcp_name, validation_prompt)
+            else:
+                # At most one of these still needs the LLM
+                if result is None:
+                    result = await self._run_tool(extract_insights, interaction_data)
+                if validation is None:
+                    validation = await self._run_tool(validate_hcp, hcp_name)
+            
+            state["tool_results"] = {**result, "validation": validation}
             
             if result.get("success"):
                 # Format insights as text
@@ -255,30 +451,36 @@ Return ONLY the intent name, nothing else: log, edit, schedule, insights, or val
                 actions = result.get("recommended_actions", [])
                 priority = result.get("priority_level", 'Medium')
                 
-                insights = f"Priority: {priority}\n\n"
-                if opportunities:
-                    insights += f"Opportunities:\n- {chr(10).join(['- ' + o for o in opportunities])}\n\n"
-                if concerns:
-                    insights += f"Concerns:\n- {chr(10).join(['- ' + c for c in concerns])}\n\n"
-                if actions:
-                    insights += f"Recommended Actions:\n- {chr(10).join(['- ' + a for a in actions])}"
+                # One buffer of lines, joined once
+                lines = [f"Priority: {priority}", ""]
+                for title, items in (
+                    ("Opportunities", opportunities),
+                    ("Concerns", concerns),
+                    ("Recommended Actions", actions)
+                ):
+                    if items:
+                        lines.append(f"{title}:")
+                        lines.extend("- " + item for item in items)
+                        lines.append("")
+                insights = "\n".join(lines).rstrip("\n")
                 
                 # Merge with existing data
-                form_data = state.get("current_form_data", {}).copy()
+                form_data = state["current_snapshot"]
                 form_data["key_insights"] = insights
+                
                 state["form_data"] = form_data
             else:
                 state["error"] = result.get("error", "Unknown error")
                 
         except Exception as e:
-            print(f"❌ Error in extract_insights_node: {e}")
+            logger.error("❌ Error in enrich_parallel_node: %s", e)
             state["error"] = str(e)
         
         return state
     
-    def _validate_hcp_node(self, state: AgentState) -> AgentState:
+    async def _validate_hcp_node(self, state: AgentState) -> AgentState:
         """Validate HCP using Tool #5."""
-        print("🔧 Running: validate_hcp tool")
+        logger.debug("🔧 Running: validate_hcp tool")
         
         try:
             hcp_name = state.get("current_form_data", {}).get("hcp_name", "")
@@ -286,12 +488,12 @@ Return ONLY the intent name, nothing else: log, edit, schedule, insights, or val
                 # Try to extract from user input
                 hcp_name = state["user_input"]
             
-            result = validate_hcp(hcp_name)
+            result = await self._run_tool(validate_hcp, hcp_name)
             state["tool_results"] = result
             
-            if result.get("success") and result.get("is_valid"):
+            if result.get("success") and result.get("is_valid") and "error" not in result:
                 # Update HCP name with formatted version
-                form_data = state.get("current_form_data", {}).copy()
+                form_data = state["current_snapshot"]
                 form_data["hcp_name"] = result.get("formatted_name")
                 
                 # Add validation info to insights
@@ -305,94 +507,44 @@ Return ONLY the intent name, nothing else: log, edit, schedule, insights, or val
                 state["error"] = result.get("error", "Validation failed")
                 
         except Exception as e:
-            print(f"❌ Error in validate_hcp_node: {e}")
+            logger.error("❌ Error in validate_hcp_node: %s", e)
             state["error"] = str(e)
         
         return state
     
-    def _formatter_node(self, state: AgentState) -> AgentState:
+    async def _formatter_node(self, state: AgentState) -> AgentState:
         """Format the final response for the user."""
-        print("💬 Formatting response...")
+        logger.debug("💬 Formatting response...")
         
         intent = state.get("intent", "unknown")
-        error = state.get("error")
         tool_results = state.get("tool_results", {})
         form_data = state.get("form_data", {})
         
-        if error:
-            state["chat_response"] = f"❌ Sorry, I encountered an error: {error}"
-            return state
-        
         # Build friendly response based on intent
-        if intent == "log":
-            hcp_name = form_data.get("hcp_name", "the HCP")
-            sentiment = form_data.get("sentiment", "neutral")
-            response = f"✓ I've logged your interaction with {hcp_name}.\n\n"
-            response += f"📋 Details captured:\n"
-            response += f"- Date: {form_data.get('date', 'N/A')}\n"
-            response += f"- Sentiment: {sentiment}\n"
-            if form_data.get("materials_shared"):
-                response += f"- Materials: {', '.join(form_data['materials_shared'])}\n"
-            if form_data.get("products_discussed"):
-                response += f"- Products: {', '.join(form_data['products_discussed'])}\n"
-            response += f"\nYour interaction has been recorded successfully!"
-        
-        elif intent == "edit":
-            response = "✓ I've updated the interaction with your changes.\n\n"
-            response += f"📝 Current data:\n"
-            response += f"- HCP: {form_data.get('hcp_name', 'N/A')}\n"
-            response += f"- Sentiment: {form_data.get('sentiment', 'N/A')}\n"
-            response += f"The form has been updated."
-        
-        elif intent == "schedule":
-            follow_up = tool_results.get("follow_up_date", "soon")
-            talking_points = tool_results.get("talking_points", [])
-            response = f"✓ Follow-up scheduled for {follow_up}!\n\n"
-            if talking_points:
-                response += f"📅 Talking points:\n"
-                for point in talking_points:
-                    response += f"  • {point}\n"
-            prep = tool_results.get("preparation_notes")
-            if prep:
-                response += f"\n📌 Preparation: {prep}"
-        
-        elif intent == "insights":
-            priority = tool_results.get("priority_level", 'Medium')
-            opportunities = tool_results.get("opportunities", [])
-            actions = tool_results.get("recommended_actions", [])
-            
-            response = f"🔍 Analysis complete! Priority: {priority}\n\n"
-            if opportunities:
-                response += f"✨ Opportunities:\n"
-                for opp in opportunities:
-                    response += f"  • {opp}\n"
-            if actions:
-                response += f"\n🎯 Recommended actions:\n"
-                for action in actions:
-                    response += f"  • {action}\n"
-        
-        elif intent == "validate":
-            formatted = tool_results.get("formatted_name", "Unknown")
-            specialty = tool_results.get("likely_specialty", "Unknown")
-            response = f"✓ HCP information validated!\n\n"
-            response += f"👨‍⚕️ Name: {formatted}\n"
-            response += f"🏥 Likely specialty: {specialty}\n"
-            if tool_results.get("requires_verification"):
-                response += f"\n⚠️ Manual verification recommended."
-        
-        else:
-            response = "✓ Request processed successfully!"
+        formatter = _FORMATTERS.get(intent, _fmt_default)
+        response = formatter(form_data, tool_results)
         
         state["chat_response"] = response
         return state
     
-    def process(self, user_input: str, current_form_data: dict = None) -> dict:
+    async def _error_formatter_node(self, state: AgentState) -> AgentState:
+        """Fast path: build the error response without the full formatter."""
+        state["chat_response"] = f"❌ Sorry, I encountered an error: {state['error']}"
+        return state
+    
+    async def aprocess(
+        self,
+        user_input: str,
+        current_form_data: dict = None,
+        thread_id: str = None
+    ) -> dict:
         """
         Main entry point for processing user messages.
         
         Args:
             user_input: User's natural language message
             current_form_data: Current form data (for edits) or None (for new)
+            thread_id: Conversation thread (only used when AGENT_CHECKPOINTING is on)
         
         Returns:
             {
@@ -402,16 +554,19 @@ Return ONLY the intent name, nothing else: log, edit, schedule, insights, or val
                 'success': True/False
             }
         """
-        print(f"\n{'='*70}")
-        print(f"🤖 HCP Agent Processing Request")
-        print(f"{'='*70}")
-        print(f"Input: {user_input}")
-        print(f"Has existing data: {bool(current_form_data and current_form_data.get('hcp_name'))}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "🤖 HCP Agent processing request | input=%r | has existing data=%s",
+                user_input,
+                bool(current_form_data and current_form_data.get("hcp_name"))
+            )
         
         # Initialize state
         initial_state: AgentState = {
             "user_input": user_input,
             "current_form_data": current_form_data or {},
+            "current_snapshot": {},
+            "extraction": None,
             "form_data": {},
             "tool_results": {},
             "intent": "",
@@ -421,11 +576,12 @@ Return ONLY the intent name, nothing else: log, edit, schedule, insights, or val
         
         try:
             # Run the graph
-            final_state = self.graph.invoke(initial_state)
+            config = None
+            if settings.AGENT_CHECKPOINTING:
+                config = {"configurable": {"thread_id": thread_id or "default"}}
+            final_state = await self.graph.ainvoke(initial_state, config=config)
             
-            print(f"\n✅ Processing complete!")
-            print(f"Intent: {final_state.get('intent', 'unknown')}")
-            print(f"{'='*70}\n")
+            logger.debug("✅ Processing complete! Intent: %s", final_state.get("intent", "unknown"))
             
             return {
                 "form_data": final_state.get("form_data", {}),
@@ -435,14 +591,27 @@ Return ONLY the intent name, nothing else: log, edit, schedule, insights, or val
             }
             
         except Exception as e:
-            print(f"❌ Agent error: {e}")
+            logger.error("❌ Agent error: %s", e)
             return {
                 "form_data": current_form_data or {},
                 "chat_response": f"❌ Sorry, I encountered an error: {str(e)}",
                 "intent": "error",
                 "success": False
             }
+    
+    def process(self, user_input: str, current_form_data: dict = None, thread_id: str = None) -> dict:
+        """Synchronous wrapper around aprocess() for scripts and tests."""
+        return asyncio.run(self.aprocess(user_input, current_form_data, thread_id))
+
+
+# Global agent instance, created on first use so importing this module
+# doesn't build the graph
+_AGENT: Optional[HCPAgent] = None
 
 
-# Global agent instance
-agent = HCPAgent()
+def get_agent() -> HCPAgent:
+    """Return the shared HCPAgent, creating it on first call."""
+    global _AGENT
+    if _AGENT is None:
+        _AGENT = HCPAgent()
+    return _AGENT
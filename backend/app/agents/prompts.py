@@ -0,0 +1,45 @@
+"""
+Few-shot examples shared by the extraction prompts.
+
+These are appended to the static system prompts, so they are part of the
+cached prefix: the provider reuses them across calls instead of
+reprocessing them. Bump the version suffix when changing an example (the
+system prompt is part of the response cache key).
+"""
+
+# Worked examples for log_interaction (flat extraction JSON)
+LOG_FEW_SHOTS_V1 = """Examples (today's date in these examples is 2026-01-18):
+
+Message: "Met Dr. Anita Rao at City Hospital yesterday and walked her through the CardioPlus trial data. She was skeptical about the dosing schedule. Left two sample packs."
+JSON: {"hcp_name": "Dr. Anita Rao", "date": "2026-01-17", "sentiment": "Neutral", "materials_shared": ["sample packs"], "discussion_summary": "Reviewed CardioPlus trial data; concerns about the dosing schedule", "products_discussed": ["CardioPlus"]}
+
+Message: "Great call with dr. james lee today, he wants to start GlucoControl for his new type 2 patients. Sent him the efficacy brochure and the patient leaflet."
+JSON: {"hcp_name": "Dr. James Lee", "date": "2026-01-18", "sentiment": "Positive", "materials_shared": ["efficacy brochure", "patient leaflet"], "discussion_summary": "Plans to start GlucoControl for new type 2 diabetes patients", "products_discussed": ["GlucoControl"]}
+
+Message: "Dr. Okafor cancelled halfway through, said she has no time for reps this quarter."
+JSON: {"hcp_name": "Dr. Okafor", "date": "2026-01-18", "sentiment": "Negative", "materials_shared": [], "discussion_summary": "Meeting cut short; no time for reps this quarter", "products_discussed": []}
+"""
+
+# Worked examples for classify_and_extract (intent + extraction JSON)
+ROUTER_FEW_SHOTS_V1 = """Examples (today's date in these examples is 2026-01-18):
+
+Message: "Saw Dr. Mehta this morning, discussed NeuroCalm side effects, she was positive. Shared the safety summary."
+Existing interaction data: None
+JSON: {"intent": "log", "extraction": {"hcp_name": "Dr. Mehta", "date": "2026-01-18", "sentiment": "Positive", "materials_shared": ["safety summary"], "discussion_summary": "Discussed NeuroCalm side effects", "products_discussed": ["NeuroCalm"]}}
+
+Message: "Sorry, it was Dr. Meera Mehta, and I also left samples."
+Existing interaction data: {"hcp_name": "Dr. Mehta", "materials_shared": ["safety summary"], "sentiment": "Positive"}
+JSON: {"intent": "edit", "extraction": {"hcp_name": "Dr. Meera Mehta", "materials_shared": ["safety summary", "samples"]}}
+
+Message: "Set up a meeting with her in two weeks to go over the pricing."
+Existing interaction data: {"hcp_name": "Dr. Meera Mehta"}
+JSON: {"intent": "schedule", "extraction": {}}
+
+Message: "What should I focus on with this doctor?"
+Existing interaction data: {"hcp_name": "Dr. Meera Mehta"}
+JSON: {"intent": "insights", "extraction": {}}
+
+Message: "Can you check that the doctor's name is right?"
+Existing interaction data: {"hcp_name": "dr meera mehta"}
+JSON: {"intent": "validate", "extraction": {}}
+"""
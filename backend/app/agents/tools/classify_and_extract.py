@@ -0,0 +1,69 @@
+"""
+Router: Classify and Extract
+Classifies the user's intent and, for log/edit, extracts the interaction
+data in the same structured-output LLM call.
+"""
+import orjson
+from datetime import datetime
+from app.utils.llm_utils import cached_aextract_json, TOOL_MAX_TOKENS
+from app.agents.prompts import ROUTER_FEW_SHOTS_V1
+
+
+# Static instructions, sent as the system prompt (cacheable prefix)
+_CLASSIFY_AND_EXTRACT_SYSTEM_PROMPT = """You are the assistant of a medical sales CRM. Classify the user's message and, for "log" or "edit", extract the interaction data in the same answer.
+
+Intents:
+- "log": the user describes a NEW interaction with an HCP
+- "edit": the user corrects existing data (only possible when existing data is present)
+- "schedule": the user wants to schedule a follow-up meeting
+- "insights": the user asks for analysis, opportunities or insights
+- "validate": the user wants the HCP information verified
+
+Extraction rules:
+- intent "log": extraction has hcp_name, date (YYYY-MM-DD, default today's date given with the message), sentiment ("Positive", "Negative" or "Neutral"), materials_shared (array), discussion_summary, products_discussed (array). Use null for unknown strings and [] for unknown arrays.
+- intent "edit": extraction has ONLY the fields the user wants to change (hcp_name, date, sentiment, materials_shared, discussion_summary, products_discussed, follow_up_date), or {} if nothing changed.
+- any other intent: extraction is {}.
+
+Return ONLY valid JSON:
+{"intent": "log|edit|schedule|insights|validate", "extraction": {}}
+
+""" + ROUTER_FEW_SHOTS_V1
+
+# Per-call data, sent as the user prompt
+_CLASSIFY_AND_EXTRACT_TEMPLATE = """User message: "{user_message}"
+Today's date is {today}.
+Existing interaction data: {current_data}"""
+
+async def classify_and_extract(user_message: str, current_data: dict = None) -> dict:
+    """
+    Classify intent and extract log/edit fields with one LLM call.
+
+    Args:
+        user_message: User's natural language message
+        current_data: Existing interaction data, or None for a new interaction
+
+    Returns:
+        {
+            'intent': 'log',  # Raw label from the LLM (may need normalizing)
+            'extraction': {...}  # Log fields, changed fields, or None if unusable
+        }
+    """
+    prompt = _CLASSIFY_AND_EXTRACT_TEMPLATE.format(
+        user_message=user_message,
+        today=datetime.now().strftime('%Y-%m-%d'),
+        current_data=orjson.dumps(current_data, option=orjson.OPT_SORT_KEYS).decode() if current_data else "None"
+    )
+
+    result = await cached_aextract_json(
+        prompt,
+        temperature=0.1,
+        max_tokens=TOOL_MAX_TOKENS["classify_and_extract"],
+        response_format={"type": "json_object"},
+        system_prompt=_CLASSIFY_AND_EXTRACT_SYSTEM_PROMPT
+    )
+
+    extraction = result.get('extraction')
+    return {
+        'intent': str(result.get('intent') or ''),
+        'extraction': extraction if isinstance(extraction, dict) and 'error' not in result else None
+    }
@@ -2,11 +2,65 @@
 Tool #2: Edit Interaction
 Updates interaction by identifying ONLY changed fields.
 """
-import json
-from app.utils.llm_utils import llm
+import logging
+import orjson
+from app.utils.llm_utils import cached_aextract_json, TOOL_MAX_TOKENS
 
+logger = logging.getLogger(__name__)
 
-def edit_interaction(current_data: dict, user_message: str) -> dict:
+
+# Static instructions, sent as the system prompt (cacheable prefix)
+_EDIT_SYSTEM_PROMPT = """You are an expert medical sales assistant. The user wants to correct/update an existing HCP interaction record.
+
+Identify ONLY the fields that the user wants to change and extract their new values.
+
+Return ONLY valid JSON (no markdown, no explanation) with ONLY the fields that changed:
+
+Example: If user says "sentiment was negative", return: {"sentiment": "Negative"}
+Example: If user says "name was Dr. John and I shared samples", return: {"hcp_name": "Dr. John", "materials_shared": ["samples"]}
+
+Available fields you can change:
+- hcp_name (string)
+- date (YYYY-MM-DD format)
+- sentiment ("Positive", "Negative", or "Neutral")
+- materials_shared (array of strings)
+- discussion_summary (string)
+- products_discussed (array of strings)
+- follow_up_date (YYYY-MM-DD format or null)
+
+Return ONLY the changed fields as JSON. If nothing changed, return {}.
+"""
+
+# Per-call data, sent as the user prompt
+_EDIT_PROMPT_TEMPLATE = """Current interaction data:
+{current_data}
+
+User's correction message: "{user_message}"
+"""
+
+def apply_changes(current_data: dict, changes: dict) -> dict:
+    """
+    Merge LLM-extracted changes over the current data.
+    
+    Args:
+        current_data: Current interaction dictionary
+        changes: Changed fields returned by the LLM
+    
+    Returns:
+        Updated dictionary with 'success': True
+    """
+    # If LLM returned error or empty
+    if 'error' in changes or not changes:
+        changes = {}
+    
+    # Merge changes with current data (changes override)
+    updated_data = current_data | changes
+    updated_data['success'] = True
+    
+    return updated_data
+
+
+async def edit_interaction(current_data: dict, user_message: str) -> dict:
     """
     Update interaction by identifying which fields changed.
     
@@ -36,50 +90,21 @@ def edit_interaction(current_data: dict, user_message: str) -> dict:
         }
     """
     
-    prompt = f"""You are an expert medical sales assistant. The user wants to correct/update an existing HCP interaction record.
-
-Current interaction data:
-{json.dumps(current_data, indent=2)}
-
-User's correction message: "{user_message}"
-
-Identify ONLY the fields that the user wants to change and extract their new values.
-
-Return ONLY valid JSON (no markdown, no explanation) with ONLY the fields that changed:
-
-Example: If user says "sentiment was negative", return: {{"sentiment": "Negative"}}
-Example: If user says "name was Dr. John and I shared samples", return: {{"hcp_name": "Dr. John", "materials_shared": ["samples"]}}
-
-Available fields you can change:
-- hcp_name (string)
-- date (YYYY-MM-DD format)
-- sentiment ("Positive", "Negative", or "Neutral")
-- materials_shared (array of strings)
-- discussion_summary (string)
-- products_discussed (array of strings)
-- follow_up_date (YYYY-MM-DD format or null)
-
-Return ONLY the changed fields as JSON. If nothing changed, return {{}}.
-"""
+    prompt = _EDIT_PROMPT_TEMPLATE.format(
+        current_data=orjson.dumps(current_data, option=orjson.OPT_SORT_KEYS).decode(),
+        user_message=user_message
+    )
     
     try:
-        changes = llm.extract_json(prompt, temperature=0.1)
-        
-        # If LLM returned error or empty
-        if 'error' in changes or not changes:
-            changes = {}
-        
-        # Merge changes with current data (changes override)
-        updated_data = {**current_data, **changes}
-        updated_data['success'] = True
-        
-        return updated_data
+        changes = await cached_aextract_json(
+            prompt,
+            temperature=0.1,
+            max_tokens=TOOL_MAX_TOKENS["edit_interaction"],
+            system_prompt=_EDIT_SYSTEM_PROMPT
+        )
+        return apply_changes(current_data, changes)
         
     except Exception as e:
-        print(f"❌ Error in edit_interaction tool: {e}")
+        logger.error("❌ Error in edit_interaction tool: %s", e, exc_info=True)
         # Return original data on error
-        return {
-            'success': False,
-            'error': str(e),
-            **current_data
-        }
+        return current_data | {'success': False, 'error': str(e)}
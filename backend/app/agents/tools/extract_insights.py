@@ -2,11 +2,132 @@
 Tool #4: Extract Insights
 AI-powered analysis of interaction opportunities and concerns.
 """
-from app.utils.llm_utils import llm
-import json
+import logging
+from typing import Optional, Tuple
+from app.utils.llm_utils import cached_aextract_json, TOOL_MAX_TOKENS
 
+logger = logging.getLogger(__name__)
 
-def extract_insights(interaction_data: dict) -> dict:
+
+# Answer budget for the insights JSON
+INSIGHTS_MAX_TOKENS = TOOL_MAX_TOKENS["extract_insights"]
+
+# Static instructions, sent as the system prompt (cacheable prefix)
+_INSIGHTS_SYSTEM_PROMPT = """You are a medical sales analyst. Analyze the HCP interaction given by the user and extract strategic insights.
+
+Analyze this interaction and provide:
+
+1. opportunities: 2-3 sales opportunities or positive signals identified
+2. concerns: Any concerns, objections, or negative signals (or empty array if none)
+3. recommended_actions: 2-3 specific next actions to move the opportunity forward
+4. priority_level: Overall priority ("High", "Medium", or "Low") based on opportunity potential
+
+Consider:
+- Sentiment indicates interest level
+- Materials shared show engagement depth
+- Discussion topics reveal needs
+
+Return ONLY valid JSON (no markdown):
+{
+    "opportunities": ["opportunity1", "opportunity2"],
+    "concerns": ["concern1"],
+    "recommended_actions": ["action1", "action2"],
+    "priority_level": "High|Medium|Low"
+}
+"""
+
+# Per-call data, sent as the user prompt
+_INSIGHTS_PROMPT_TEMPLATE = """Interaction Details:
+- HCP: {hcp_name}
+- Sentiment: {sentiment}
+- Discussion: {discussion}
+- Products Discussed: {products}
+- Materials Shared: {materials}"""
+
+def _priority_from_sentiment(sentiment: str) -> str:
+    """Derive a priority level from the interaction sentiment."""
+    if sentiment == 'Positive':
+        return 'High'
+    elif sentiment == 'Negative':
+        return 'Low'
+    return 'Medium'
+
+
+def empty_insights(interaction_data: dict) -> Optional[dict]:
+    """
+    Deterministic answer for an interaction with nothing to analyze.
+    
+    Args:
+        interaction_data: The interaction dictionary
+    
+    Returns:
+        Insights without an LLM call, or None if the interaction has a
+        discussion summary, products or materials
+    """
+    if interaction_data.get('discussion_summary') or interaction_data.get('products_discussed') \
+            or interaction_data.get('materials_shared'):
+        return None
+    
+    return {
+        'success': True,
+        'opportunities': [],
+        'concerns': [],
+        'recommended_actions': ['Gather more interaction details'],
+        'priority_level': _priority_from_sentiment(interaction_data.get('sentiment', 'Neutral'))
+    }
+
+
+def build_insights_prompt(interaction_data: dict) -> Tuple[str, str]:
+    """
+    Build the insights prompt (no LLM call).
+    
+    Args:
+        interaction_data: The interaction dictionary
+    
+    Returns:
+        (system_prompt, prompt) asking for opportunities, concerns,
+        recommended_actions, priority_level
+    """
+    products = interaction_data.get('products_discussed', [])
+    materials = interaction_data.get('materials_shared', [])
+    
+    return _INSIGHTS_SYSTEM_PROMPT, _INSIGHTS_PROMPT_TEMPLATE.format(
+        hcp_name=interaction_data.get('hcp_name', 'Unknown HCP'),
+        sentiment=interaction_data.get('sentiment', 'Neutral'),
+        discussion=interaction_data.get('discussion_summary', 'No discussion summary'),
+        products=', '.join(products) if products else 'None',
+        materials=', '.join(materials) if materials else 'None'
+    )
+
+
+def finalize_insights(result: dict, interaction_data: dict) -> dict:
+    """
+    Fill in defaults on a parsed insights answer.
+    
+    Args:
+        result: Parsed LLM output for the insights prompt
+        interaction_data: The interaction dictionary (for the sentiment)
+    
+    Returns:
+        The insights result with success and defaults set
+    """
+    result['success'] = True
+    
+    # Provide defaults
+    if not result.get('opportunities'):
+        result['opportunities'] = []
+    if not result.get('concerns'):
+        result['concerns'] = []
+    if not result.get('recommended_actions'):
+        result['recommended_actions'] = ['Follow up with HCP']
+    if not result.get('priority_level'):
+        # Auto-determine priority from sentiment
+        result['priority_level'] = _priority_from_sentiment(interaction_data.get('sentiment', 'Neutral'))
+    
+    return result
+
+
+async def extract_insights(interaction_data: dict) -> dict:
     """
     Extract key insights from an HCP interaction.
     
@@ -34,68 +155,20 @@ def extract_insights(interaction_data: dict) -> dict:
         }
     """
     
-    # Extract key fields for analysis
-    hcp_name = interaction_data.get('hcp_name', 'Unknown HCP')
-    sentiment = interaction_data.get('sentiment', 'Neutral')
-    discussion = interaction_data.get('discussion_summary', 'No discussion summary')
-    products = interaction_data.get('products_discussed', [])
-    materials = interaction_data.get('materials_shared', [])
+    empty = empty_insights(interaction_data)
+    if empty is not None:
+        return empty
     
-    prompt = f"""You are a medical sales analyst. Analyze this HCP interaction and extract strategic insights.
-
-Interaction Details:
-- HCP: {hcp_name}
-- Sentiment: {sentiment}
-- Discussion: {discussion}
-- Products Discussed: {', '.join(products) if products else 'None'}
-- Materials Shared: {', '.join(materials) if materials else 'None'}
-
-Analyze this interaction and provide:
-
-1. opportunities: 2-3 sales opportunities or positive signals identified
-2. concerns: Any concerns, objections, or negative signals (or empty array if none)
-3. recommended_actions: 2-3 specific next actions to move the opportunity forward
-4. priority_level: Overall priority ("High", "Medium", or "Low") based on opportunity potential
-
-Consider:
-- Sentiment indicates interest level
-- Materials shared show engagement depth
-- Discussion topics reveal needs
-
-Return ONLY valid JSON (no markdown):
-{{
-    "opportunities": ["opportunity1", "opportunity2"],
-    "concerns": ["concern1"],
-    "recommended_actions": ["action1", "action2"],
-    "priority_level": "High|Medium|Low"
-}}
-"""
+    system_prompt, prompt = build_insights_prompt(interaction_data)
     
     try:
-        result = llm.extract_json(prompt, temperature=0.3)
-        
-        result['success'] = True
-        
-        # Provide defaults
-        if not result.get('opportunities'):
-            result['opportunities'] = []
-        if not result.get('concerns'):
-            result['concerns'] = []
-        if not result.get('recommended_actions'):
-            result['recommended_actions'] = ['Follow up with HCP']
-        if not result.get('priority_level'):
-            # Auto-determine priority from sentiment
-            if sentiment == 'Positive':
-                result['priority_level'] = 'High'
-            elif sentiment == 'Negative':
-                result['priority_level'] = 'Low'
-            else:
-                result['priority_level'] = 'Medium'
-        
-        return result
+        result = await cached_aextract_json(
+            prompt, temperature=0.3, max_tokens=INSIGHTS_MAX_TOKENS, system_prompt=system_prompt
+        )
+        return finalize_insights(result, interaction_data)
         
     except Exception as e:
-        print(f"❌ Error in extract_insights tool: {e}")
+        logger.error("❌ Error in extract_insights tool: %s", e, exc_info=True)
         return {
             'success': False,
             'error': str(e),
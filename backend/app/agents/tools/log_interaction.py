@@ -2,12 +2,83 @@
 Tool #1: Log Interaction
 Extracts structured HCP interaction data from natural language.
 """
+import logging
 import json
 from datetime import datetime
-from app.utils.llm_utils import llm
+from app.utils.llm_utils import cached_aextract_json, TOOL_MAX_TOKENS
+from app.agents.prompts import LOG_FEW_SHOTS_V1
 
+logger = logging.getLogger(__name__)
 
-def log_interaction(user_message: str) -> dict:
+
+# Static instructions, sent as the system prompt (cacheable prefix)
+_LOG_SYSTEM_PROMPT = """You are an expert medical sales assistant. Extract structured information from the user's message about their HCP interaction.
+
+Extract the following information and return ONLY valid JSON (no markdown, no code blocks, no explanation):
+
+1. hcp_name: The doctor/healthcare professional's name (e.g., "Dr. Smith", "Dr. John Patel")
+2. date: The date of meeting in YYYY-MM-DD format. If not specified, use today's date (given with the message)
+3. sentiment: The overall sentiment (must be one of: "Positive", "Negative", or "Neutral")
+4. materials_shared: Array of materials/documents shared (e.g., ["brochures", "samples", "clinical data"])
+5. discussion_summary: Brief summary of what was discussed
+6. products_discussed: Array of product names mentioned (e.g., ["product X", "diabetes medication"])
+
+Return ONLY this JSON format, nothing else:
+{
+    "hcp_name": "extracted name or null",
+    "date": "YYYY-MM-DD",
+    "sentiment": "Positive|Negative|Neutral",
+    "materials_shared": ["item1", "item2"],
+    "discussion_summary": "brief summary",
+    "products_discussed": ["product1", "product2"]
+}
+
+IMPORTANT: 
+- If a field cannot be extracted, use null for strings or [] for arrays
+- Always return valid JSON
+- Do not include any text before or after the JSON
+
+""" + LOG_FEW_SHOTS_V1
+
+# Per-call data, sent as the user prompt
+_LOG_PROMPT_TEMPLATE = """User message: "{user_message}"
+
+Today's date is {today}."""
+
+def apply_log_defaults(result: dict, today: str = None) -> dict:
+    """
+    Fill in defaults for fields the LLM could not extract.
+    
+    Args:
+        result: Raw extraction from the LLM
+        today: Default meeting date (YYYY-MM-DD), defaults to today
+    
+    Returns:
+        The same dictionary with all fields present and 'success': True
+    """
+    today = today or datetime.now().strftime('%Y-%m-%d')
+    
+    # Ensure all required fields exist
+    result['success'] = True
+    
+    # Provide defaults for missing fields
+    if not result.get('hcp_name'):
+        result['hcp_name'] = None
+    if not result.get('date'):
+        result['date'] = today
+    if not result.get('sentiment'):
+        result['sentiment'] = 'Neutral'
+    if not result.get('materials_shared'):
+        result['materials_shared'] = []
+    if not result.get('discussion_summary'):
+        result['discussion_summary'] = None
+    if not result.get('products_discussed'):
+        result['products_discussed'] = []
+    
+    return result
+
+
+async def log_interaction(user_message: str) -> dict:
     """
     Extract structured interaction data from natural language.
     
@@ -37,61 +108,20 @@ def log_interaction(user_message: str) -> dict:
     
     today = datetime.now().strftime('%Y-%m-%d')
     
-    prompt = f"""You are an expert medical sales assistant. Extract structured information from the user's message about their HCP interaction.
-
-User message: "{user_message}"
-
-Today's date is {today}.
-
-Extract the following information and return ONLY valid JSON (no markdown, no code blocks, no explanation):
-
-1. hcp_name: The doctor/healthcare professional's name (e.g., "Dr. Smith", "Dr. John Patel")
-2. date: The date of meeting in YYYY-MM-DD format. If not specified, use today's date: {today}
-3. sentiment: The overall sentiment (must be one of: "Positive", "Negative", or "Neutral")
-4. materials_shared: Array of materials/documents shared (e.g., ["brochures", "samples", "clinical data"])
-5. discussion_summary: Brief summary of what was discussed
-6. products_discussed: Array of product names mentioned (e.g., ["product X", "diabetes medication"])
-
-Return ONLY this JSON format, nothing else:
-{{
-    "hcp_name": "extracted name or null",
-    "date": "YYYY-MM-DD",
-    "sentiment": "Positive|Negative|Neutral",
-    "materials_shared": ["item1", "item2"],
-    "discussion_summary": "brief summary",
-    "products_discussed": ["product1", "product2"]
-}}
-
-IMPORTANT: 
-- If a field cannot be extracted, use null for strings or [] for arrays
-- Always return valid JSON
-- Do not include any text before or after the JSON
-"""
+    prompt = _LOG_PROMPT_TEMPLATE.format(user_message=user_message, today=today)
     
     try:
-        result = llm.extract_json(prompt, temperature=0.1)
-        
-        # Ensure all required fields exist
-        result['success'] = True
-        
-        # Provide defaults for missing fields
-        if not result.get('hcp_name'):
-            result['hcp_name'] = None
-        if not result.get('date'):
-            result['date'] = today
-        if not result.get('sentiment'):
-            result['sentiment'] = 'Neutral'
-        if not result.get('materials_shared'):
-            result['materials_shared'] = []
-        if not result.get('discussion_summary'):
-            result['discussion_summary'] = None
-        if not result.get('products_discussed'):
-            result['products_discussed'] = []
+        result = await cached_aextract_json(
+            prompt,
+            temperature=0.1,
+            max_tokens=TOOL_MAX_TOKENS["log_interaction"],
+            system_prompt=_LOG_SYSTEM_PROMPT
+        )
         
-        return result
+        return apply_log_defaults(result, today)
         
     except Exception as e:
-        print(f"❌ Error in log_interaction tool: {e}")
+        logger.error("❌ Error in log_interaction tool: %s", e, exc_info=True)
         return {
             'success': False,
             'error': str(e),
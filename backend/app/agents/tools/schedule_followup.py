@@ -2,12 +2,263 @@
 Tool #3: Schedule Follow-up
 Creates follow-up meetings with AI-generated talking points.
 """
+import logging
+import re
 from datetime import datetime, timedelta
-from app.utils.llm_utils import llm
-import json
+from typing import Optional, Tuple
+from app.utils.llm_utils import get_llm, TOOL_MAX_TOKENS
 
+logger = logging.getLogger(__name__)
 
-def schedule_followup(hcp_name: str, user_message: str) -> dict:
+
+# A short JSON answer; the cap keeps generation time bounded
+FOLLOWUP_MAX_TOKENS = TOOL_MAX_TOKENS["schedule_followup"]
+
+_WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# Common relative dates, resolved in Python instead of by the LLM
+_REL_DATE = re.compile(
+    r"\b(?:(?P<day_after>day\s+after\s+tomorrow)"
+    r"|(?P<today>today)"
+    r"|(?P<tomorrow>tomorrow)"
+    r"|next\s+(?P<next>week|month|" + "|".join(_WEEKDAYS) + r")"
+    r"|in\s+(?P<count>\d{1,3})\s+(?P<unit>day|week)s?)\b",
+    re.IGNORECASE
+)
+
+# A relative date in the same clause as a scheduling verb ("book ... next
+# friday"); temporal words elsewhere ("busy tomorrow") are left to the LLM
+_SCHEDULED_REL_DATE = re.compile(
+    r"\b(?:schedule|book|set\s+up|arrange|plan)\b[^,;!?\n]*?" + _REL_DATE.pattern,
+    re.IGNORECASE
+)
+
+# One word of an HCP name; words that can start or qualify a date phrase
+# ("the day after tomorrow", "on friday") end the name
+_NAME_WORD = r"(?!(?:the|on|in|at|for|this|next|today|tomorrow|day)\b)[\w.'-]+"
+
+# "<verb> a follow-up [with <hcp>] <relative date> [to discuss <topic>]" and
+# nothing after it: answered without an LLM call. The date grammar is
+# _REL_DATE's, so both resolve a phrase the same way.
+_FAST = re.compile(
+    r"\b(?:schedule|set\s+up|book)\s+(?:a\s+)?(?:follow[- ]?up|meeting)\s+"
+    r"(?:with\s+(?:" + _NAME_WORD + r"\s+){1,4})?"
+    r"(?:the\s+)?(?P<when>" + _REL_DATE.pattern + r")"
+    r"(?:\s+to\s+(?:(?:discuss|review|talk(?:\s+about)?|go\s+over)\s+)?(?P<topic>[^.!?\n]+))?"
+    r"\s*[.!?]?\s*$",
+    re.IGNORECASE
+)
+
+# Static instructions, sent as the system prompt (cacheable prefix)
+_FOLLOWUP_SYSTEM_PROMPT = """You are a medical sales coach helping schedule follow-up meetings.
+
+Extract follow-up scheduling information from the user's request:
+
+1. follow_up_date: Infer the date from the user's message in YYYY-MM-DD format
+   - "next week" = approximately the next-week date given with the request
+   - "next month" = approximately the next-month date given with the request
+   - "tomorrow" = one day from today
+   - If no specific time mentioned, default to one week from today
+
+2. talking_points: Generate 3-4 key topics to discuss in the follow-up
+   - Based on the user's message
+   - Be specific and actionable
+
+3. preparation_notes: What should be prepared before the meeting
+   - Materials needed
+   - Data to gather
+   - Questions to prepare
+
+Return JSON:
+{
+    "follow_up_date": "YYYY-MM-DD",
+    "talking_points": ["point1", "point2", "point3"],
+    "preparation_notes": "what to prepare"
+}
+"""
+
+# Per-call data, sent as the user prompt
+_FOLLOWUP_PROMPT = """HCP Name: {hcp_name}
+User request: "{user_message}"
+Today's date: {today}
+Next week: {next_week}
+Next month: {next_month}"""
+
+# Used when the date was already resolved from the message
+_FOLLOWUP_POINTS_SYSTEM_PROMPT = """You are a medical sales coach preparing a follow-up meeting.
+
+1. talking_points: 3-4 specific, actionable topics to discuss, based on the user's request
+2. preparation_notes: Materials, data and questions to prepare before the meeting
+
+Return JSON:
+{
+    "talking_points": ["point1", "point2", "point3"],
+    "preparation_notes": "what to prepare"
+}
+"""
+
+_FOLLOWUP_POINTS_PROMPT = """HCP Name: {hcp_name}
+User request: "{user_message}"
+"""
+
+
+def _date_from_match(match: re.Match, now: datetime = None) -> str:
+    """Turn a _REL_DATE-style match into YYYY-MM-DD."""
+    now = now or datetime.now()
+    if match.group("day_after"):
+        days = 2
+    elif match.group("today"):
+        days = 0
+    elif match.group("tomorrow"):
+        days = 1
+    elif match.group("count"):
+        days = int(match.group("count")) * (7 if match.group("unit").lower() == "week" else 1)
+    else:
+        target = match.group("next").lower()
+        if target == "week":
+            days = 7
+        elif target == "month":
+            days = 30
+        else:
+            # Next occurrence of the weekday, never today
+            days = (_WEEKDAYS.index(target) - now.weekday()) % 7 or 7
+    
+    return (now + timedelta(days=days)).strftime('%Y-%m-%d')
+
+
+def resolve_relative_date(user_message: str, now: datetime = None) -> Optional[str]:
+    """
+    Resolve the relative date attached to the scheduling verb.
+    
+    Only a phrase in the same clause as schedule/book/set up/arrange/plan
+    counts ("book a follow-up next friday"); "busy tomorrow, book it for
+    March 3rd" resolves to None so the LLM reads the date.
+    
+    Args:
+        user_message: User's follow-up request
+        now: Reference time (defaults to datetime.now())
+    
+    Returns:
+        Date as YYYY-MM-DD, or None if no scheduling phrase has a known date
+    """
+    match = _SCHEDULED_REL_DATE.search(user_message)
+    return _date_from_match(match, now) if match else None
+
+
+def first_relative_date(text: str, now: datetime = None) -> Optional[str]:
+    """
+    Resolve the first relative date phrase anywhere in text.
+    
+    Args:
+        text: Message or phrase to scan
+        now: Reference time (defaults to datetime.now())
+    
+    Returns:
+        Date as YYYY-MM-DD, or None if the text has no known phrase
+    """
+    match = _REL_DATE.search(text)
+    return _date_from_match(match, now) if match else None
+
+
+def fastpath_followup(hcp_name: str, user_message: str, now: datetime = None) -> Optional[dict]:
+    """
+    Answer simple scheduling requests without the LLM.
+    
+    Args:
+        hcp_name: The HCP's name
+        user_message: User's follow-up request
+        now: Reference time (defaults to datetime.now())
+    
+    Returns:
+        A follow-up result with source='fastpath', or None if the message
+        doesn't fit the simple grammar
+    """
+    match = _FAST.search(user_message)
+    if not match:
+        return None
+    
+    topic = (match.group("topic") or "").strip()
+    if _REL_DATE.search(topic):
+        # A second date phrase ("... to discuss X, not tomorrow"): let the LLM read it
+        return None
+    
+    return {
+        'follow_up_date': _date_from_match(match, now),
+        'talking_points': [f"Discuss {topic}" if topic else 'Follow-up discussion', 'Address questions', 'Next steps'],
+        'preparation_notes': f"Prepare materials on {topic}" if topic else 'Review previous interaction notes',
+        'hcp_name': hcp_name,
+        'success': True,
+        'source': 'fastpath'
+    }
+
+
+def build_followup_prompt(hcp_name: str, user_message: str) -> Tuple[str, str]:
+    """
+    Build the follow-up scheduling prompt (no LLM call).
+    
+    Args:
+        hcp_name: The HCP's name
+        user_message: User's follow-up request
+    
+    Returns:
+        (system_prompt, prompt) asking for talking_points and
+        preparation_notes, plus follow_up_date when the message has no
+        known relative date
+    """
+    if resolve_relative_date(user_message) is not None:
+        return _FOLLOWUP_POINTS_SYSTEM_PROMPT, _FOLLOWUP_POINTS_PROMPT.format_map({
+            "hcp_name": hcp_name,
+            "user_message": user_message
+        })
+    
+    today = datetime.now().strftime('%Y-%m-%d')
+    next_week = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
+    next_month = (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d')
+    
+    return _FOLLOWUP_SYSTEM_PROMPT, _FOLLOWUP_PROMPT.format_map({
+        "hcp_name": hcp_name,
+        "user_message": user_message,
+        "today": today,
+        "next_week": next_week,
+        "next_month": next_month
+    })
+
+
+def finalize_followup(result: dict, hcp_name: str, user_message: str) -> dict:
+    """
+    Fill in defaults on a parsed follow-up answer.
+    
+    Args:
+        result: Parsed LLM output for the follow-up prompt
+        hcp_name: The HCP's name
+        user_message: User's follow-up request (for the resolved date)
+    
+    Returns:
+        The follow-up result with success, hcp_name and defaults set
+    """
+    next_week = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
+    
+    result['success'] = True
+    result['hcp_name'] = hcp_name
+    
+    resolved_date = resolve_relative_date(user_message)
+    if resolved_date:
+        # The prompt didn't ask for a date; use the one tied to the request
+        result['follow_up_date'] = resolved_date
+    elif not result.get('follow_up_date'):
+        # LLM gave no date: fall back to any relative phrase, then next week
+        result['follow_up_date'] = first_relative_date(user_message) or next_week
+    
+    # Provide defaults
+    if not result.get('talking_points'):
+        result['talking_points'] = ['Follow-up discussion', 'Address questions', 'Next steps']
+    if not result.get('preparation_notes'):
+        result['preparation_notes'] = 'Review previous interaction notes'
+    
+    return result
+
+
+async def schedule_followup(hcp_name: str, user_message: str) -> dict:
     """
     Schedule a follow-up meeting with AI-generated talking points.
     
@@ -25,63 +276,26 @@ def schedule_followup(hcp_name: str, user_message: str) -> dict:
             'talking_points': ['Discuss trial results', 'Share new data', 'Address concerns'],
             'preparation_notes': 'Prepare trial data presentation',
             'hcp_name': 'Dr. Smith',
-            'success': True
+            'success': True,
+            'source': 'fastpath'  # Only set when answered without the LLM
         }
     """
     
-    today = datetime.now().strftime('%Y-%m-%d')
-    next_week = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
-    next_month = (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d')
+    fast = fastpath_followup(hcp_name, user_message)
+    if fast is not None:
+        return fast
     
-    prompt = f"""You are a medical sales coach helping schedule follow-up meetings.
-
-HCP Name: {hcp_name}
-User request: "{user_message}"
-Today's date: {today}
-
-Extract follow-up scheduling information:
-
-1. follow_up_date: Infer the date from the user's message in YYYY-MM-DD format
-   - "next week" = approximately {next_week}
-   - "next month" = approximately {next_month}
-   - "tomorrow" = one day from today
-   - If no specific time mentioned, default to one week from today
-
-2. talking_points: Generate 3-4 key topics to discuss in the follow-up
-   - Based on the user's message
-   - Be specific and actionable
-
-3. preparation_notes: What should be prepared before the meeting
-   - Materials needed
-   - Data to gather
-   - Questions to prepare
-
-Return ONLY valid JSON (no markdown):
-{{
-    "follow_up_date": "YYYY-MM-DD",
-    "talking_points": ["point1", "point2", "point3"],
-    "preparation_notes": "what to prepare"
-}}
-"""
+    next_week = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
+    system_prompt, prompt = build_followup_prompt(hcp_name, user_message)
     
     try:
-        result = llm.extract_json(prompt, temperature=0.2)
-        
-        result['success'] = True
-        result['hcp_name'] = hcp_name
-        
-        # Provide defaults
-        if not result.get('follow_up_date'):
-            result['follow_up_date'] = next_week
-        if not result.get('talking_points'):
-            result['talking_points'] = ['Follow-up discussion', 'Address questions', 'Next steps']
-        if not result.get('preparation_notes'):
-            result['preparation_notes'] = 'Review previous interaction notes'
-        
-        return result
+        result = await get_llm().aextract_json(
+            prompt, temperature=0, json_mode=True, max_tokens=FOLLOWUP_MAX_TOKENS, system_prompt=system_prompt
+        )
+        return finalize_followup(result, hcp_name, user_message)
         
     except Exception as e:
-        print(f"❌ Error in schedule_followup tool: {e}")
+        logger.error("❌ Error in schedule_followup tool: %s", e, exc_info=True)
         return {
             'success': False,
             'error': str(e),
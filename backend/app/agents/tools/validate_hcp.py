@@ -2,11 +2,164 @@
 Tool #5: Validate HCP
 Validates and enriches HCP information.
 """
-from app.utils.llm_utils import llm
-import json
+import asyncio
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Optional, Tuple
+from app.utils.llm_utils import get_llm, get_llm_cache, LLMCache, estimate_tokens, TOOL_MAX_TOKENS
+import orjson
 
+logger = logging.getLogger(__name__)
 
-def validate_hcp(hcp_name: str) -> dict:
+
+# Validation depends only on the name, so successful results are reused
+VALIDATION_CACHE_TTL_DAYS = 30
+
+# A short JSON answer; the cap keeps generation time bounded
+VALIDATE_MAX_TOKENS = TOOL_MAX_TOKENS["validate_hcp"]
+
+# In-process LRU tier in front of the SQLite cache (normalized name → result)
+VALIDATION_MEMO_SIZE = 4096
+_memo: "OrderedDict[str, dict]" = OrderedDict()
+_memo_lock = threading.Lock()
+
+# Static instructions, sent as the system prompt (cacheable prefix)
+_VALIDATE_SYSTEM_PROMPT = """You are a healthcare database expert. Validate and enrich the HCP name given by the user.
+
+Analyze and return:
+
+1. is_valid: Is this a valid HCP name format? (true/false)
+   - Valid examples: "Dr. Smith", "Dr. John Patel", "Prof. Williams"
+   - Invalid examples: "doctor", "xyz", "123"
+
+2. formatted_name: Properly formatted name with correct capitalization and title
+   - Add "Dr." prefix if missing but clearly a doctor's name
+   - Proper case for names (e.g., "smith" → "Smith")
+   - Keep existing titles (Dr., Prof., etc.)
+
+3. likely_specialty: Best guess of medical specialty based on common naming patterns or context
+   - Options: "Cardiology", "Neurology", "Oncology", "Pediatrics", "General Practice", "Surgery", "Unknown"
+   - If no context, use "General Practice"
+
+4. validation_notes: Any issues found or corrections made
+   - Examples: "Name format corrected", "Added Dr. prefix", "No issues found"
+
+5. requires_verification: Should this be manually verified? (true/false)
+   - True if name is very short, unusual, or incomplete
+
+Return JSON:
+{
+    "is_valid": true,
+    "formatted_name": "Dr. Name",
+    "likely_specialty": "Cardiology",
+    "validation_notes": "notes here",
+    "requires_verification": false
+}
+"""
+
+# Per-call data, sent as the user prompt
+_VALIDATE_PROMPT = 'HCP Name: "{hcp_name}"'
+
+
+def _normalize(hcp_name: str) -> str:
+    """NFKC-normalize, lower-case and collapse whitespace in a name."""
+    return " ".join(unicodedata.normalize("NFKC", hcp_name).lower().split())
+
+
+def _cache_key(normalized: str) -> str:
+    """SQLite cache key for a normalized name."""
+    return LLMCache.make_key("validate_hcp", get_llm().model_primary, normalized, 0, VALIDATE_MAX_TOKENS)
+
+
+def _remember(normalized: str, result: dict):
+    """Store a result in the in-process LRU, evicting the oldest entry."""
+    with _memo_lock:
+        _memo[normalized] = result
+        _memo.move_to_end(normalized)
+        if len(_memo) > VALIDATION_MEMO_SIZE:
+            _memo.popitem(last=False)
+
+
+def build_validation_prompt(hcp_name: str) -> Tuple[str, str]:
+    """
+    Build the HCP validation prompt (no LLM call).
+    
+    Args:
+        hcp_name: The HCP's name to validate
+    
+    Returns:
+        (system_prompt, prompt) asking for is_valid, formatted_name,
+        likely_specialty, validation_notes, requires_verification
+    """
+    return _VALIDATE_SYSTEM_PROMPT, _VALIDATE_PROMPT.format_map({"hcp_name": hcp_name})
+
+
+def cached_validation(hcp_name: str) -> Optional[dict]:
+    """
+    Return the cached validation for a name, or None on a miss.
+    
+    Checks the in-process LRU first, then the SQLite cache (blocking;
+    run it in a worker thread from async code).
+    """
+    normalized = _normalize(hcp_name)
+    with _memo_lock:
+        cached = _memo.get(normalized)
+        if cached is not None:
+            _memo.move_to_end(normalized)
+    
+    if cached is None:
+        cached = get_llm_cache().get(_cache_key(normalized))
+        if cached is None:
+            return None
+        _remember(normalized, cached)
+    
+    # Copy so callers can't mutate the shared entry
+    return {**cached, 'hcp_name': hcp_name, 'cache_hit': True}  # Original name
+
+
+def finalize_validation(result: dict, hcp_name: str, prompt: str) -> dict:
+    """
+    Fill in defaults on a parsed validation answer and cache it.
+    
+    Writes to the SQLite cache (blocking; run it in a worker thread from
+    async code).
+    
+    Args:
+        result: Parsed LLM output for the validation prompt
+        hcp_name: The HCP's name that was validated
+        prompt: The prompt that produced result (for the token estimate)
+    
+    Returns:
+        The validation result with success, hcp_name and defaults set
+    """
+    result['success'] = True
+    result['hcp_name'] = hcp_name  # Original name
+    
+    # Provide defaults
+    if 'is_valid' not in result:
+        result['is_valid'] = True
+    if not result.get('formatted_name'):
+        result['formatted_name'] = hcp_name.title()
+    if not result.get('likely_specialty'):
+        result['likely_specialty'] = 'General Practice'
+    if not result.get('validation_notes'):
+        result['validation_notes'] = 'Name validated'
+    if 'requires_verification' not in result:
+        result['requires_verification'] = False
+    
+    result['cache_hit'] = False
+    if 'error' not in result:
+        tokens = estimate_tokens(prompt) + estimate_tokens(orjson.dumps(result).decode())
+        normalized = _normalize(hcp_name)
+        get_llm_cache().set(_cache_key(normalized), result, tokens, VALIDATION_CACHE_TTL_DAYS)
+        _remember(normalized, dict(result))
+    
+    return result
+
+
+async def validate_hcp(hcp_name: str) -> dict:
     """
     Validate and enrich HCP information.
     
@@ -26,7 +179,8 @@ def validate_hcp(hcp_name: str) -> dict:
             'likely_specialty': 'General Practice',
             'validation_notes': 'Name format corrected to proper case',
             'requires_verification': False,
-            'success': True
+            'success': True,
+            'cache_hit': False  # True when served from the validation cache
         }
     """
     
@@ -39,63 +193,20 @@ def validate_hcp(hcp_name: str) -> dict:
             'requires_verification': True
         }
     
-    prompt = f"""You are a healthcare database expert. Validate and enrich this HCP name.
-
-HCP Name: "{hcp_name}"
-
-Analyze and return:
-
-1. is_valid: Is this a valid HCP name format? (true/false)
-   - Valid examples: "Dr. Smith", "Dr. John Patel", "Prof. Williams"
-   - Invalid examples: "doctor", "xyz", "123"
-
-2. formatted_name: Properly formatted name with correct capitalization and title
-   - Add "Dr." prefix if missing but clearly a doctor's name
-   - Proper case for names (e.g., "smith" → "Smith")
-   - Keep existing titles (Dr., Prof., etc.)
-
-3. likely_specialty: Best guess of medical specialty based on common naming patterns or context
-   - Options: "Cardiology", "Neurology", "Oncology", "Pediatrics", "General Practice", "Surgery", "Unknown"
-   - If no context, use "General Practice"
-
-4. validation_notes: Any issues found or corrections made
-   - Examples: "Name format corrected", "Added Dr. prefix", "No issues found"
-
-5. requires_verification: Should this be manually verified? (true/false)
-   - True if name is very short, unusual, or incomplete
-
-Return ONLY valid JSON (no markdown):
-{{
-    "is_valid": true,
-    "formatted_name": "Dr. Name",
-    "likely_specialty": "Cardiology",
-    "validation_notes": "notes here",
-    "requires_verification": false
-}}
-"""
+    cached = await asyncio.to_thread(cached_validation, hcp_name)
+    if cached is not None:
+        return cached
+    
+    system_prompt, prompt = build_validation_prompt(hcp_name)
     
     try:
-        result = llm.extract_json(prompt, temperature=0.1)
-        
-        result['success'] = True
-        result['hcp_name'] = hcp_name  # Original name
-        
-        # Provide defaults
-        if 'is_valid' not in result:
-            result['is_valid'] = True
-        if not result.get('formatted_name'):
-            result['formatted_name'] = hcp_name.title()
-        if not result.get('likely_specialty'):
-            result['likely_specialty'] = 'General Practice'
-        if not result.get('validation_notes'):
-            result['validation_notes'] = 'Name validated'
-        if 'requires_verification' not in result:
-            result['requires_verification'] = False
-        
-        return result
+        result = await get_llm().aextract_json(
+            prompt, temperature=0, json_mode=True, max_tokens=VALIDATE_MAX_TOKENS, system_prompt=system_prompt
+        )
+        return await asyncio.to_thread(finalize_validation, result, hcp_name, prompt)
         
     except Exception as e:
-        print(f"❌ Error in validate_hcp tool: {e}")
+        logger.error("❌ Error in validate_hcp tool: %s", e, exc_info=True)
         return {
             'success': False,
             'error': str(e),
@@ -14,6 +14,22 @@ class Settings(BaseSettings):
     GROQ_MODEL_PRIMARY: str = "gemma2-9b-it"
     GROQ_MODEL_BACKUP: str = "llama-3.3-70b-versatile"
     
+    # Exact-match LLM response cache
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PATH: str = "./llm_cache.db"
+    
+    # Semantic intent cache (opt-in; needs requirements-intent-cache.txt)
+    INTENT_CACHE_ENABLED: bool = False
+    INTENT_CACHE_PATH: str = "./intent_cache.db"
+    INTENT_CACHE_MODEL: str = "all-MiniLM-L6-v2"
+    INTENT_CACHE_THRESHOLD: float = 0.90
+    
+    # Agent: keep per-thread graph state in memory (off for stateless requests)
+    AGENT_CHECKPOINTING: bool = False
+    
+    # Agent: compile the graph and open LLM/embedding resources at startup
+    AGENT_WARMUP: bool = True
+    
     # Server
     LOG_LEVEL: str = "INFO"
     DEBUG: bool = True
@@ -23,7 +39,7 @@ class Settings(BaseSettings):
         case_sensitive = False
 
 
-@lru_cache()
+@lru_cache(maxsize=1)
 def get_settings():
     """Get cached settings instance."""
     return Settings()
@@ -1,36 +1,85 @@
 """Database connection and session management."""
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session, declarative_base
+import logging
+from typing import AsyncIterator
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import get_settings
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
-# Create SQLite engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Needed for SQLite
+
+def _async_url(url: str) -> str:
+    """Use the aiosqlite driver for plain sqlite:// URLs."""
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+# Create async SQLite engine with a persistent connection pool
+engine = create_async_engine(
+    _async_url(settings.DATABASE_URL),
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=10,
+    max_overflow=0
 )
 
-# Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Applied to every new pooled connection; WAL lets readers run alongside a
+# writer and NORMAL sync avoids an fsync on every commit
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA foreign_keys=ON",
+)
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Tune each new SQLite connection."""
+        cursor = dbapi_connection.cursor()
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+# Session factory (objects stay readable after commit)
+SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
 
 # Base class for models
 Base = declarative_base()
 
 
-def get_db() -> Session:
+async def get_db() -> AsyncIterator[AsyncSession]:
     """
     Dependency for getting database session.
     Use with FastAPI's Depends().
     """
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-def init_db():
-    """Create all tables in the database."""
-    Base.metadata.create_all(bind=engine)
-    print("✅ Database initialized successfully!")
+# Indexes removed from the models, dropped from databases that still have them
+_RETIRED_INDEXES = (
+    "ix_interactions_hcp_name",  # Prefix of ix_interactions_hcp_created
+)
+
+
+def _create_schema(sync_conn):
+    """Create missing tables and indexes, and drop retired indexes."""
+    Base.metadata.create_all(sync_conn)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+    for name in _RETIRED_INDEXES:
+        sync_conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+async def init_db():
+    """Create all tables (and missing indexes) in the database."""
+    async with engine.begin() as conn:
+        await conn.run_sync(_create_schema)
+    logger.info("✅ Database initialized successfully!")
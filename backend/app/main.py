@@ -1,23 +1,51 @@
 """FastAPI application entry point."""
+import asyncio
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from cachetools import TTLCache
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.database.db import Base, engine, init_db
+from app.database.db import init_db
 from app.routes import chat
+from app.agents.hcp_agent import get_agent
+from app.utils.llm_utils import get_llm, aclose_llm
+from app.utils.intent_cache import intent_cache
 from app.config import get_settings
 
-# Initialize database tables
-Base.metadata.create_all(bind=engine)
-
 # Get settings
 settings = get_settings()
 
+# Configure logging (use LOG_LEVEL=WARNING in production).
+# Handlers only enqueue records; a background thread does the stream I/O.
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, logging.StreamHandler(), respect_handler_level=True)
+logging.basicConfig(
+    level=settings.LOG_LEVEL.upper(),
+    format="%(levelname)s:%(name)s:%(message)s",
+    handlers=[QueueHandler(log_queue)]
+)
+# Started with the handler so records logged at import time are written;
+# stopped (flushing the queue) at interpreter exit
+log_listener.start()
+atexit.register(log_listener.stop)
+logger = logging.getLogger(__name__)
+
 # Create FastAPI app
 app = FastAPI(
     title="AI CRM HCP Module",
     description="Healthcare Professional CRM with AI-driven interaction logging",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse  # C-level JSON encoder
 )
 
+# Encoded GET /api/interactions/{id} bodies (per process; use Redis across workers)
+app.state.interaction_cache = TTLCache(maxsize=1024, ttl=30)
+# Per-id write counter: a GET only caches what it read if no write bumped it meanwhile
+app.state.interaction_generations = {}
+
 # Configure CORS (allow frontend to connect)
 origins = [
     "http://localhost:5173",  # Vite default
@@ -53,12 +81,39 @@ async def health_check():
     return {"status": "healthy"}
 
 
+async def warm_agent():
+    """
+    Do first-request setup at startup instead.
+    
+    Compiles the agent graph, opens the Groq connection (TLS handshake via
+    a token-free models listing) and loads the intent-cache embedding
+    model. No chat completion is sent, so no tokens are spent.
+    """
+    try:
+        get_agent()
+        llm = get_llm()
+        llm.initialize()
+        await llm.async_client.models.list()
+        if intent_cache.enabled:
+            await asyncio.to_thread(intent_cache.embed, "warmup")
+        logger.info("🔥 Agent warmed up")
+    except Exception as e:
+        # Warmup is best-effort; the first request will do it instead
+        logger.warning("⚠️ Agent warmup failed: %s", e)
+
+
 @app.on_event("startup")
 async def startup_event():
     """Run on application startup."""
-    init_db()
-    print("\n" + "="*50)
-    print("🚀 AI CRM HCP Module Backend Started!")
-    print("📖 API Docs: http://localhost:8000/docs")
-    print("💚 Health Check: http://localhost:8000/health")
-    print("="*50 + "\n")
+    await init_db()
+    if settings.AGENT_WARMUP:
+        await warm_agent()
+    logger.info("🚀 AI CRM HCP Module Backend Started!")
+    logger.info("📖 API Docs: http://localhost:8000/docs")
+    logger.info("💚 Health Check: http://localhost:8000/health")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Run on application shutdown."""
+    await aclose_llm()
@@ -1,5 +1,5 @@
 """SQLAlchemy models for HCP interactions."""
-from sqlalchemy import Column, Integer, String, Date, DateTime, JSON, Enum as SQLEnum
+from sqlalchemy import Column, Index, Integer, String, Date, DateTime, JSON, Enum as SQLEnum
 from sqlalchemy.sql import func
 from app.database.db import Base
 from datetime import datetime
@@ -31,9 +31,12 @@ class Interaction(Base):
     """
     
     __tablename__ = "interactions"
+    __table_args__ = (
+        Index("ix_interactions_hcp_created", "hcp_name", "created_at"),  # Per-HCP timelines
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    hcp_name = Column(String(255), nullable=False, index=True)
+    hcp_name = Column(String(255), nullable=False)  # Lookups use ix_interactions_hcp_created
     date = Column(Date, nullable=False)
     sentiment = Column(SQLEnum(SentimentEnum), default=SentimentEnum.NEUTRAL)
     materials_shared = Column(JSON, default=list)  # Stores as JSON array
@@ -41,23 +44,28 @@ class Interaction(Base):
     products_discussed = Column(JSON, default=list)  # Stores as JSON array
     follow_up_date = Column(Date, nullable=True)
     key_insights = Column(String(2000), nullable=True)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, server_default=func.now(), index=True)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
     def to_dict(self):
-        """Convert model instance to dictionary."""
+        """
+        Convert model instance to dictionary.
+        
+        Dates and timestamps are left as date/datetime objects; orjson
+        encodes them natively.
+        """
         return {
             'id': self.id,
             'hcp_name': self.hcp_name,
-            'date': str(self.date) if self.date else None,
+            'date': self.date,
             'sentiment': self.sentiment.value if self.sentiment else None,
             'materials_shared': self.materials_shared or [],
             'discussion_summary': self.discussion_summary,
             'products_discussed': self.products_discussed or [],
-            'follow_up_date': str(self.follow_up_date) if self.follow_up_date else None,
+            'follow_up_date': self.follow_up_date,
             'key_insights': self.key_insights,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
     
     def __repr__(self):
@@ -2,9 +2,13 @@
 API routes for HCP interaction management.
 Connects FastAPI endpoints with LangGraph agent.
 """
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+import logging
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from datetime import datetime, date
 
 from app.database.db import get_db
@@ -14,19 +18,43 @@ from app.schemas.interaction_schema import (
     ChatResponse,
     InteractionCreate,
     InteractionUpdate,
-    InteractionResponse
+    InteractionResponse,
+    InteractionPage,
+    INTERACTION_RESPONSE_ADAPTER,
+    INTERACTION_RESPONSE_LIST_ADAPTER,
+    CHAT_RESPONSE_ADAPTER
 )
-from app.agents.hcp_agent import agent
+from app.agents.hcp_agent import get_agent
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["chat"])
 
+# Lower-cased sentiment string → enum (unknown values map to Neutral)
+_SENTIMENT_MAP = {
+    "positive": SentimentEnum.POSITIVE,
+    "negative": SentimentEnum.NEGATIVE,
+    "neutral": SentimentEnum.NEUTRAL,
+}
+
+
+def _json_response(adapter: TypeAdapter, obj, status_code: int = 200) -> Response:
+    """
+    Validate obj with a prebuilt TypeAdapter and return the encoded JSON.
+    
+    Skips FastAPI's per-request response_model validation and encoding;
+    response_model stays on the routes for the OpenAPI docs.
+    """
+    body = adapter.dump_json(adapter.validate_python(obj, from_attributes=True))
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
 
 # ============================================================================
 # MAIN CHAT ENDPOINT (Uses LangGraph Agent)
 # ============================================================================
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat_endpoint(request: ChatRequest, db: Session = Depends(get_db)):
+async def chat_endpoint(request: ChatRequest, db: AsyncSession = Depends(get_db)):
     """
     Main chat endpoint that processes natural language using LangGraph agent.
     
@@ -47,9 +75,7 @@ async def chat_endpoint(request: ChatRequest, db: Session = Depends(get_db)):
         # Load existing interaction if ID provided
         current_form_data = None
         if request.interaction_id:
-            interaction = db.query(Interaction).filter(
-                Interaction.id == request.interaction_id
-            ).first()
+            interaction = await db.get(Interaction, request.interaction_id)
             
             if not interaction:
                 raise HTTPException(status_code=404, detail="Interaction not found")
@@ -57,9 +83,10 @@ async def chat_endpoint(request: ChatRequest, db: Session = Depends(get_db)):
             current_form_data = interaction.to_dict()
         
         # Process with LangGraph agent
-        result = agent.process(
+        result = await get_agent().aprocess(
             user_input=request.message,
-            current_form_data=current_form_data
+            current_form_data=current_form_data,
+            thread_id=str(request.interaction_id) if request.interaction_id else None
         )
         
         if not result.get("success"):
@@ -69,16 +96,16 @@ async def chat_endpoint(request: ChatRequest, db: Session = Depends(get_db)):
             )
         
         # Return response
-        return ChatResponse(
-            form_data=result["form_data"],
-            chat_response=result["chat_response"],
-            interaction_id=request.interaction_id
-        )
+        return _json_response(CHAT_RESPONSE_ADAPTER, {
+            "form_data": result["form_data"],
+            "chat_response": result["chat_response"],
+            "interaction_id": request.interaction_id
+        })
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Chat endpoint error: {e}")
+        logger.error("❌ Chat endpoint error: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -86,8 +113,49 @@ async def chat_endpoint(request: ChatRequest, db: Session = Depends(get_db)):
 # CRUD ENDPOINTS FOR INTERACTIONS
 # ============================================================================
 
+def _invalidate_cached(request: Request, interaction_id: int):
+    """Drop an interaction's cached body and bump its write generation."""
+    generations = request.app.state.interaction_generations
+    generations[interaction_id] = generations.get(interaction_id, 0) + 1
+    request.app.state.interaction_cache.pop(interaction_id, None)
+
+
+# Upper bound on rows accepted by one bulk request
+MAX_BULK_INTERACTIONS = 500
+
+
+async def _insert_interactions(db: AsyncSession, interactions: List[InteractionCreate]) -> List[Interaction]:
+    """
+    Insert interactions with one INSERT ... RETURNING and a single commit.
+    
+    Args:
+        db: Database session
+        interactions: Validated interactions to insert
+    
+    Returns:
+        The created rows (with ids and timestamps), in input order
+    """
+    rows = []
+    for interaction in interactions:
+        row = interaction.model_dump()
+        # Convert sentiment string to enum
+        row["sentiment"] = _SENTIMENT_MAP.get(interaction.sentiment.lower(), SentimentEnum.NEUTRAL)
+        
+        rows.append(row)
+    
+    # SQLAlchemy batches the parameter sets into multi-row INSERTs; RETURNING
+    # rows come back in parameter order only when asked for
+    result = await db.scalars(
+        insert(Interaction).returning(Interaction, sort_by_parameter_order=True),
+        rows
+    )
+    created = result.all()
+    await db.commit()
+    return created
+
+
 @router.post("/interactions", response_model=InteractionResponse, status_code=201)
-async def create_interaction(interaction: InteractionCreate, db: Session = Depends(get_db)):
+async def create_interaction(interaction: InteractionCreate, db: AsyncSession = Depends(get_db)):
     """
     Create a new interaction in the database.
     
@@ -101,64 +169,95 @@ async def create_interaction(interaction: InteractionCreate, db: Session = Depen
         Created interaction with ID
     """
     try:
-        # Convert sentiment string to enum
-        sentiment_enum = SentimentEnum.POSITIVE
-        if interaction.sentiment.lower() == "negative":
-            sentiment_enum = SentimentEnum.NEGATIVE
-        elif interaction.sentiment.lower() == "neutral":
-            sentiment_enum = SentimentEnum.NEUTRAL
+        db_interaction = (await _insert_interactions(db, [interaction]))[0]
         
-        # Create database model
-        db_interaction = Interaction(
-            hcp_name=interaction.hcp_name,
-            date=interaction.date,
-            sentiment=sentiment_enum,
-            materials_shared=interaction.materials_shared,
-            discussion_summary=interaction.discussion_summary,
-            products_discussed=interaction.products_discussed,
-            follow_up_date=interaction.follow_up_date,
-            key_insights=interaction.key_insights
-        )
+        logger.info("✅ Created interaction #%s for %s", db_interaction.id, db_interaction.hcp_name)
         
-        db.add(db_interaction)
-        db.commit()
-        db.refresh(db_interaction)
+        return _json_response(INTERACTION_RESPONSE_ADAPTER, db_interaction, status_code=201)
         
-        print(f"✅ Created interaction #{db_interaction.id} for {db_interaction.hcp_name}")
+    except Exception as e:
+        await db.rollback()
+        logger.error("❌ Error creating interaction: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/interactions/bulk", response_model=List[InteractionResponse], status_code=201)
+async def create_interactions_bulk(
+    interactions: List[InteractionCreate],
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create many interactions in one transaction.
+    
+    Args:
+        interactions: Up to MAX_BULK_INTERACTIONS InteractionCreate items
+        db: Database session
+    
+    Returns:
+        Created interactions with IDs, in request order
+    """
+    if len(interactions) > MAX_BULK_INTERACTIONS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {MAX_BULK_INTERACTIONS} interactions per request"
+        )
+    if not interactions:
+        return []
+    
+    try:
+        created = await _insert_interactions(db, interactions)
         
-        return db_interaction
+        logger.info("✅ Created %s interactions in bulk", len(created))
+        
+        return _json_response(INTERACTION_RESPONSE_LIST_ADAPTER, created, status_code=201)
         
     except Exception as e:
-        db.rollback()
-        print(f"❌ Error creating interaction: {e}")
+        await db.rollback()
+        logger.error("❌ Error creating interactions in bulk: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/interactions/{interaction_id}", response_model=InteractionResponse)
-async def get_interaction(interaction_id: int, db: Session = Depends(get_db)):
+async def get_interaction(interaction_id: int, request: Request, db: AsyncSession = Depends(get_db)):
     """
     Get a single interaction by ID.
     
+    Serves the encoded JSON from app.state.interaction_cache when present,
+    skipping the DB read and serialization. A body is only cached when no
+    update/delete of the row ran while it was being read.
+    
     Args:
         interaction_id: The interaction ID
+        request: Incoming request (for the app-level cache)
         db: Database session
     
     Returns:
         Interaction data
     """
-    interaction = db.query(Interaction).filter(Interaction.id == interaction_id).first()
+    cache = request.app.state.interaction_cache
+    generations = request.app.state.interaction_generations
+    body = cache.get(interaction_id)
     
-    if not interaction:
-        raise HTTPException(status_code=404, detail="Interaction not found")
+    if body is None:
+        generation = generations.get(interaction_id, 0)
+        interaction = await db.get(Interaction, interaction_id)
+        
+        if not interaction:
+            raise HTTPException(status_code=404, detail="Interaction not found")
+        
+        body = orjson.dumps(interaction.to_dict())
+        if generations.get(interaction_id, 0) == generation:
+            cache[interaction_id] = body
     
-    return interaction
+    return Response(content=body, media_type="application/json")
 
 
 @router.patch("/interactions/{interaction_id}", response_model=InteractionResponse)
 async def update_interaction(
     interaction_id: int,
     update_data: InteractionUpdate,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update an existing interaction (partial update supported).
@@ -166,16 +265,21 @@ async def update_interaction(
     Args:
         interaction_id: The interaction ID
         update_data: Fields to update (all optional)
+        request: Incoming request (for the app-level cache)
         db: Database session
     
     Returns:
         Updated interaction
     """
-    interaction = db.query(Interaction).filter(Interaction.id == interaction_id).first()
+    interaction = await db.get(Interaction, interaction_id)
     
     if not interaction:
         raise HTTPException(status_code=404, detail="Interaction not found")
     
+    # Invalidated before the write and again after the commit: a GET that
+    # read the old row in between sees a new generation and doesn't cache it
+    _invalidate_cached(request, interaction_id)
+    
     try:
         # Update only provided fields
         update_dict = update_data.model_dump(exclude_unset=True)
@@ -183,80 +287,155 @@ async def update_interaction(
         for field, value in update_dict.items():
             if field == "sentiment" and value:
                 # Convert sentiment to enum
-                if value.lower() == "positive":
-                    value = SentimentEnum.POSITIVE
-                elif value.lower() == "negative":
-                    value = SentimentEnum.NEGATIVE
-                else:
-                    value = SentimentEnum.NEUTRAL
+                value = _SENTIMENT_MAP.get(value.lower(), SentimentEnum.NEUTRAL)
             
             setattr(interaction, field, value)
         
-        db.commit()
-        db.refresh(interaction)
+        await db.commit()
+        _invalidate_cached(request, interaction_id)
+        await db.refresh(interaction)
         
-        print(f"✅ Updated interaction #{interaction_id}")
+        logger.info("✅ Updated interaction #%s", interaction_id)
         
-        return interaction
+        return _json_response(INTERACTION_RESPONSE_ADAPTER, interaction)
         
     except Exception as e:
-        db.rollback()
-        print(f"❌ Error updating interaction: {e}")
+        await db.rollback()
+        logger.error("❌ Error updating interaction: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/interactions", response_model=List[InteractionResponse])
+def _iso_sql(column: str) -> str:
+    """SQL expression rendering a stored DATETIME as ISO-8601 ("T" separator)."""
+    return f"replace({column}, ' ', 'T')"
+
+
+def _list_page_sql(where: str) -> str:
+    """
+    One page of interactions rendered as a JSON array by SQLite itself, plus
+    the (created_at, id) of its last row for the next cursor. Enum columns
+    store member names, so sentiment is mapped back to its value.
+    """
+    return f"""
+WITH page AS (
+    SELECT * FROM interactions
+    {where}
+    ORDER BY created_at DESC, id DESC
+    LIMIT :limit
+)
+SELECT
+    coalesce(json_group_array(json_object(
+        'id', id,
+        'hcp_name', hcp_name,
+        'date', date,
+        'sentiment', CASE sentiment {" ".join(f"WHEN '{s.name}' THEN '{s.value}'" for s in SentimentEnum)} END,
+        'materials_shared', coalesce(json(materials_shared), json('[]')),
+        'discussion_summary', discussion_summary,
+        'products_discussed', coalesce(json(products_discussed), json('[]')),
+        'follow_up_date', follow_up_date,
+        'key_insights', key_insights,
+        'created_at', {_iso_sql("created_at")},
+        'updated_at', {_iso_sql("updated_at")}
+    )), '[]'),
+    count(*),
+    (SELECT {_iso_sql("created_at")} FROM page ORDER BY created_at, id LIMIT 1),
+    (SELECT id FROM page ORDER BY created_at, id LIMIT 1)
+FROM page
+"""
+
+
+# Separate statements so the cursor page's bare row-value predicate can
+# seek the created_at index (an "IS NULL OR ..." guard forces a scan)
+_FIRST_PAGE_SQL = _list_page_sql("")
+_NEXT_PAGE_SQL = _list_page_sql("WHERE (created_at, id) < (:before_created_at, :before_id)")
+
+
+# Largest page list_interactions will return
+MAX_PAGE_SIZE = 500
+
+
+@router.get("/interactions", response_model=InteractionPage)
 async def list_interactions(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    before_created_at: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    List all interactions with pagination.
+    List interactions newest first, with keyset pagination.
+    
+    Pages are keyed on (created_at, id), so each page costs O(limit)
+    however deep it is. SQLite builds the JSON with json_group_array, so
+    no ORM objects or pydantic models are created.
     
     Args:
-        skip: Number of records to skip (default: 0)
-        limit: Maximum records to return (default: 100)
+        before_created_at: created_at of the last row on the previous page
+        before_id: id of the last row on the previous page (both or neither)
+        limit: Maximum records to return (default: 100, at most MAX_PAGE_SIZE)
         db: Database session
     
     Returns:
-        List of interactions
+        {"items": [...], "next_cursor": {...} or None}
     """
-    interactions = db.query(Interaction).order_by(
-        Interaction.created_at.desc()
-    ).offset(skip).limit(limit).all()
+    use_cursor = before_created_at is not None
+    if use_cursor != (before_id is not None):
+        raise HTTPException(
+            status_code=422,
+            detail="before_created_at and before_id must be sent together"
+        )
+    
+    if use_cursor:
+        row = (await db.execute(text(_NEXT_PAGE_SQL), {
+            # created_at is stored by CURRENT_TIMESTAMP as "YYYY-MM-DD HH:MM:SS"
+            "before_created_at": before_created_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "before_id": before_id,
+            "limit": limit
+        })).one()
+    else:
+        row = (await db.execute(text(_FIRST_PAGE_SQL), {"limit": limit})).one()
+    items, count, last_created_at, last_id = row
     
-    return interactions
+    next_cursor = None
+    if count == limit and last_id is not None:
+        next_cursor = {"before_created_at": last_created_at, "before_id": last_id}
+    
+    body = b'{"items":' + items.encode() + b',"next_cursor":' + orjson.dumps(next_cursor) + b"}"
+    return Response(content=body, media_type="application/json")
 
 
 @router.delete("/interactions/{interaction_id}")
-async def delete_interaction(interaction_id: int, db: Session = Depends(get_db)):
+async def delete_interaction(interaction_id: int, request: Request, db: AsyncSession = Depends(get_db)):
     """
     Delete an interaction.
     
     Args:
         interaction_id: The interaction ID
+        request: Incoming request (for the app-level cache)
         db: Database session
     
     Returns:
         Success message
     """
-    interaction = db.query(Interaction).filter(Interaction.id == interaction_id).first()
+    interaction = await db.get(Interaction, interaction_id)
     
     if not interaction:
         raise HTTPException(status_code=404, detail="Interaction not found")
     
+    # Invalidated before the write and again after the commit (see update)
+    _invalidate_cached(request, interaction_id)
+    
     try:
-        db.delete(interaction)
-        db.commit()
+        await db.delete(interaction)
+        await db.commit()
+        _invalidate_cached(request, interaction_id)
         
-        print(f"✅ Deleted interaction #{interaction_id}")
+        logger.info("✅ Deleted interaction #%s", interaction_id)
         
         return {"message": f"Interaction {interaction_id} deleted successfully"}
         
     except Exception as e:
-        db.rollback()
-        print(f"❌ Error deleting interaction: {e}")
+        await db.rollback()
+        logger.error("❌ Error deleting interaction: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -272,9 +451,10 @@ async def test_route():
         "endpoints": {
             "POST /api/chat": "Main chat endpoint (uses LangGraph agent)",
             "POST /api/interactions": "Create interaction",
+            "POST /api/interactions/bulk": "Create many interactions in one transaction",
             "GET /api/interactions/{id}": "Get single interaction",
             "PATCH /api/interactions/{id}": "Update interaction",
-            "GET /api/interactions": "List all interactions",
+            "GET /api/interactions": "List interactions (keyset paginated)",
             "DELETE /api/interactions/{id}": "Delete interaction"
         }
     }
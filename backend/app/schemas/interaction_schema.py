@@ -1,7 +1,8 @@
 """Pydantic schemas for request/response validation."""
-from pydantic import BaseModel, field_validator, model_validator
-from typing import List, Optional, Any
+from pydantic import BaseModel, ConfigDict, TypeAdapter, field_validator, field_serializer
+from typing import List, Optional
 from datetime import date as date_type, datetime
+from app.models.interaction import SentimentEnum
 
 
 class InteractionBase(BaseModel):
@@ -48,35 +49,34 @@ class InteractionUpdate(BaseModel):
 
 
 class InteractionResponse(InteractionBase):
-    """Schema for API response."""
+    """Schema for API response (built straight from the ORM row)."""
+    model_config = ConfigDict(from_attributes=True)
+    
     id: int
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    sentiment: SentimentEnum = SentimentEnum.NEUTRAL
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
     
-    @model_validator(mode='before')
+    @field_validator('materials_shared', 'products_discussed', mode='before')
     @classmethod
-    def convert_datetime_fields(cls, data: Any) -> Any:
-        """Convert datetime objects to ISO format strings."""
-        if hasattr(data, '__dict__'):
-            # It's a SQLAlchemy model
-            obj = data
-            return {
-                'id': obj.id,
-                'hcp_name': obj.hcp_name,
-                'date': obj.date,
-                'sentiment': obj.sentiment.value if hasattr(obj.sentiment, 'value') else str(obj.sentiment),
-                'materials_shared': obj.materials_shared or [],
-                'discussion_summary': obj.discussion_summary,
-                'products_discussed': obj.products_discussed or [],
-                'follow_up_date': obj.follow_up_date,
-                'key_insights': obj.key_insights,
-                'created_at': obj.created_at.isoformat() if obj.created_at else None,
-                'updated_at': obj.updated_at.isoformat() if obj.updated_at else None
-            }
-        return data
+    def default_empty_list(cls, v):
+        return v or []
     
-    class Config:
-        from_attributes = True
+    @field_serializer('created_at', 'updated_at')
+    def serialize_timestamp(self, v: Optional[datetime]) -> Optional[str]:
+        return v.isoformat() if v else None
+
+
+class InteractionCursor(BaseModel):
+    """Keyset cursor: pass both values back to fetch the next page."""
+    before_created_at: datetime
+    before_id: int
+
+
+class InteractionPage(BaseModel):
+    """One page of interactions, newest first."""
+    items: List[InteractionResponse]
+    next_cursor: Optional[InteractionCursor] = None  # None on the last page
 
 
 class ChatRequest(BaseModel):
@@ -97,3 +97,9 @@ class ChatResponse(BaseModel):
     form_data: dict
     chat_response: str
     interaction_id: Optional[int] = None
+
+
+# Reusable adapters for the response hot paths (dump_json)
+INTERACTION_RESPONSE_ADAPTER = TypeAdapter(InteractionResponse)
+INTERACTION_RESPONSE_LIST_ADAPTER = TypeAdapter(List[InteractionResponse])
+CHAT_RESPONSE_ADAPTER = TypeAdapter(ChatResponse)
@@ -0,0 +1,155 @@
+"""Semantic cache for router intent classification."""
+import re
+import sqlite3
+import threading
+from importlib.util import find_spec
+from typing import Optional
+
+from app.config import get_settings
+
+# Optional dependencies (requirements-intent-cache.txt): only looked up here,
+# and imported on first use so a disabled cache never loads torch
+_DEPENDENCIES_INSTALLED = all(
+    find_spec(module) is not None for module in ("faiss", "numpy", "sentence_transformers")
+)
+
+settings = get_settings()
+
+# Filler phrases that don't change the intent of a message
+_FILLER_RE = re.compile(r"\b(please|pls|kindly|can you|could you|would you)\b")
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_SPACE_RE = re.compile(r"\s+")
+
+
+class IntentCache:
+    """
+    Nearest-neighbour cache mapping user messages to router intents.
+
+    Messages are embedded with a sentence-transformer model and searched
+    in a FAISS inner-product index (cosine similarity on normalized
+    vectors). Entries are persisted to SQLite and reloaded on startup.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        model_name: str,
+        threshold: float = 0.90,
+        canonicalize_prompt: bool = True,
+        enabled: bool = True
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            db_path: SQLite file used to persist cached entries
+            model_name: Sentence-transformer model for embeddings
+            threshold: Minimum cosine similarity for a cache hit
+            canonicalize_prompt: Strip filler words/punctuation before embedding
+            enabled: Turn the cache off entirely
+        """
+        self.db_path = db_path
+        self.model_name = model_name
+        self.threshold = threshold
+        self.canonicalize_prompt = canonicalize_prompt
+        self.enabled = enabled and _DEPENDENCIES_INSTALLED
+
+        self._model = None
+        self._index = None
+        self._entries = []  # (has_existing_data, intent), aligned with index ids
+        self._lock = threading.Lock()
+
+    def canonicalize(self, text: str) -> str:
+        """Normalize a message so paraphrases map to the same embedding."""
+        text = text.lower()
+        if self.canonicalize_prompt:
+            text = _FILLER_RE.sub(" ", text)
+            text = _PUNCT_RE.sub(" ", text)
+        return _SPACE_RE.sub(" ", text).strip()
+
+    def embed(self, text: str):
+        """Return a normalized (1, dim) float32 embedding for a message."""
+        import numpy as np
+
+        self._load()
+        vector = self._model.encode(
+            [self.canonicalize(text)],
+            normalize_embeddings=True
+        )
+        return np.asarray(vector, dtype="float32")
+
+    def lookup(self, embedding, has_existing_data: bool, top_k: int = 5) -> Optional[str]:
+        """
+        Find a cached intent for an embedded message.
+
+        Returns:
+            The cached intent, or None on a miss
+        """
+        with self._lock:
+            if not self._entries:
+                return None
+            scores, ids = self._index.search(embedding, min(top_k, len(self._entries)))
+
+        for score, idx in zip(scores[0], ids[0]):
+            if idx < 0 or score < self.threshold:
+                break
+            cached_existing, intent = self._entries[idx]
+            if cached_existing == has_existing_data:
+                return intent
+        return None
+
+    def add(self, embedding, has_existing_data: bool, intent: str):
+        """Insert an (embedding, intent) pair and persist it (blocking I/O)."""
+        with self._lock:
+            self._index.add(embedding)
+            self._entries.append((has_existing_data, intent))
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(
+                    "INSERT INTO intent_cache (has_existing_data, intent, embedding) "
+                    "VALUES (?, ?, ?)",
+                    (int(has_existing_data), intent, embedding.tobytes())
+                )
+
+    def _load(self):
+        """Load the embedding model and persisted entries on first use."""
+        if self._model is not None:
+            return
+
+        with self._lock:
+            if self._model is not None:
+                return
+
+            import faiss
+            import numpy as np
+            from sentence_transformers import SentenceTransformer
+
+            model = SentenceTransformer(self.model_name)
+            self._index = faiss.IndexFlatIP(model.get_sentence_embedding_dimension())
+
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS intent_cache ("
+                    "id INTEGER PRIMARY KEY, "
+                    "has_existing_data INTEGER NOT NULL, "
+                    "intent TEXT NOT NULL, "
+                    "embedding BLOB NOT NULL)"
+                )
+                rows = conn.execute(
+                    "SELECT has_existing_data, intent, embedding FROM intent_cache ORDER BY id"
+                ).fetchall()
+
+            if rows:
+                vectors = np.vstack([np.frombuffer(row[2], dtype="float32") for row in rows])
+                self._index.add(vectors)
+                self._entries = [(bool(row[0]), row[1]) for row in rows]
+
+            self._model = model
+
+
+# Global instance (used by the agent router)
+intent_cache = IntentCache(
+    db_path=settings.INTENT_CACHE_PATH,
+    model_name=settings.INTENT_CACHE_MODEL,
+    threshold=settings.INTENT_CACHE_THRESHOLD,
+    enabled=settings.INTENT_CACHE_ENABLED
+)
@@ -1,9 +1,218 @@
 """Groq LLM utilities and wrapper for API calls."""
+import asyncio
+import copy
+import functools
+import hashlib
 import json
-from groq import Groq
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Optional
+import httpx
+import orjson
+from groq import Groq, AsyncGroq
 from app.config import get_settings
 
-settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class LLMCache:
+    """
+    SQLite-backed exact-match cache for parsed LLM responses.
+    
+    Keys are SHA-256 hashes of the normalized prompt plus generation
+    parameters, so only byte-identical requests hit. Tracks hits and an
+    estimate of the tokens saved.
+    """
+    
+    def __init__(self, db_path: str, enabled: bool = True):
+        """
+        Initialize the cache.
+        
+        Args:
+            db_path: SQLite file used to store cached responses
+            enabled: Turn the cache off entirely
+        """
+        self.db_path = db_path
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+        
+        if self.enabled:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS llm_cache ("
+                    "key TEXT PRIMARY KEY, "
+                    "response TEXT NOT NULL, "
+                    "tokens INTEGER NOT NULL, "
+                    "expires_at REAL NOT NULL)"
+                )
+    
+    @staticmethod
+    def make_key(provider: str, model: str, prompt: str, temperature: float, max_tokens: Optional[int]) -> str:
+        """Hash a request into a cache key (NFC-normalized prompt)."""
+        payload = json.dumps(
+            [provider, model, unicodedata.normalize("NFC", prompt), temperature, max_tokens],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached response for a key, or None on miss/expiry."""
+        if not self.enabled:
+            return None
+        
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT response, tokens, expires_at FROM llm_cache WHERE key = ?",
+                (key,)
+            ).fetchone()
+            
+            if row and row[2] < time.time():
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                row = None
+        
+        if row is None:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        self.tokens_saved += row[1]
+        return orjson.loads(row[0])
+    
+    def set(self, key: str, response: dict, tokens: int, ttl_days: float):
+        """Store a response under a key for ttl_days."""
+        if not self.enabled:
+            return
+        
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, tokens, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, orjson.dumps(response).decode(), tokens, time.time() + ttl_days * 86400)
+            )
+    
+    def stats(self) -> dict:
+        """Return hit/miss counters and estimated tokens saved."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "tokens_saved": self.tokens_saved
+        }
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return len(text) // 4
+
+
+_llm_cache: Optional[LLMCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """Return the shared LLMCache, creating its SQLite file on first call."""
+    global _llm_cache
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                settings = get_settings()
+                _llm_cache = LLMCache(settings.LLM_CACHE_PATH, enabled=settings.LLM_CACHE_ENABLED)
+    return _llm_cache
+
+
+def cached_call(provider: str = "groq", model: str = None, ttl_days: float = 7):
+    """
+    Decorator adding an exact-match cache to an async JSON-returning LLM call.
+    
+    The wrapped coroutine function must take (prompt, temperature=...,
+    max_tokens=...) and return a dict. Responses containing an "error" key
+    are not cached. The SQLite I/O runs in a worker thread.
+    
+    Args:
+        provider: Provider name (part of the cache key)
+        model: Model name (defaults to the primary model)
+        ttl_days: How long cached responses stay valid
+    """
+    def decorator(func):
+        def make_key(prompt: str, temperature: float, kwargs: dict) -> str:
+            system_prompt = kwargs.get("system_prompt")
+            return LLMCache.make_key(
+                provider,
+                model or get_settings().GROQ_MODEL_PRIMARY,
+                f"{system_prompt}\n\n{prompt}" if system_prompt else prompt,
+                temperature,
+                kwargs.get("max_tokens")
+            )
+        
+        def lookup(key: str) -> Optional[dict]:
+            return get_llm_cache().get(key)
+        
+        def store(key: str, prompt: str, result: dict):
+            if "error" not in result:
+                tokens = estimate_tokens(prompt) + estimate_tokens(orjson.dumps(result).decode())
+                get_llm_cache().set(key, result, tokens, ttl_days)
+        
+        @functools.wraps(func)
+        async def wrapper(prompt: str, temperature: float = 0.1, **kwargs) -> dict:
+            key = make_key(prompt, temperature, kwargs)
+            cached = await asyncio.to_thread(lookup, key)
+            if cached is not None:
+                return cached
+            
+            result = await func(prompt, temperature=temperature, **kwargs)
+            await asyncio.to_thread(store, key, prompt, result)
+            return result
+        
+        return wrapper
+    return decorator
+
+
+# In-process LRU of parsed extractions at (near-)deterministic temperatures
+EXTRACT_MEMO_SIZE = 1024
+EXTRACT_MEMO_MAX_TEMPERATURE = 0.1
+
+# Per-tool output caps: generation time grows with max_tokens, and each
+# tool answers with one small JSON object
+TOOL_MAX_TOKENS = {
+    "classify_and_extract": 512,
+    "log_interaction": 512,
+    "edit_interaction": 256,
+    "schedule_followup": 256,
+    "extract_insights": 384,
+    "validate_hcp": 128,
+}
+
+# Static header for abatch_extract_json (identical for every batch)
+_BATCH_SYSTEM_PROMPT = (
+    'You will complete several independent tasks, each introduced by "### TASK k". '
+    "Answer each one on its own, following its instructions.\n"
+    'Return ONLY valid JSON: an object with one key per task ("task_1", "task_2", ...), '
+    "each holding that task's JSON answer."
+)
+
+# Connection pool settings shared by the sync and async Groq clients
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60)
+_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+
+@functools.lru_cache(maxsize=64)
+def _system_message(system_prompt: str) -> dict:
+    """Prebuilt system message per static prompt (shared, never mutated)."""
+    return {"role": "system", "content": system_prompt}
+
+
+# Provider-enforced JSON output (Groq JSON mode)
+_JSON_OBJECT_FORMAT = {"type": "json_object"}
+
+# JSON object inside a ```json / ``` code block
+_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+_JSON_DECODER = json.JSONDecoder()
 
 
 class GroqLLMWrapper:
@@ -24,6 +233,7 @@ class GroqLLMWrapper:
         Args:
             api_key: Optional API key. If not provided, reads from settings.
         """
+        settings = get_settings()
         self.api_key = api_key or settings.GROQ_API_KEY
         
         if not self.api_key or self.api_key == "your_groq_api_key_will_go_here":
@@ -32,18 +242,72 @@ class GroqLLMWrapper:
                 "Please add your API key to backend/.env file"
             )
         
-        self.client = Groq(api_key=self.api_key)
+        # Keep-alive HTTP/2 pool so sync calls reuse warm TLS connections
+        self._http = httpx.Client(http2=True, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+        self.client = Groq(api_key=self.api_key, http_client=self._http)
+        self._async_client = None
+        self._async_loop = None
+        self._memo: "OrderedDict[bytes, dict]" = OrderedDict()
+        self._memo_lock = threading.Lock()
         self.model_primary = settings.GROQ_MODEL_PRIMARY
         self.model_backup = settings.GROQ_MODEL_BACKUP
+    
+    def initialize(self):
+        """Report the configured model (kept out of __init__ so construction is silent)."""
+        logger.info("✅ Groq LLM initialized with model: %s", self.model_primary)
+    
+    @property
+    def async_client(self) -> AsyncGroq:
+        """
+        Async Groq client over one keep-alive HTTP/2 connection pool.
         
-        print(f"✅ Groq LLM initialized with model: {self.model_primary}")
+        Shared by all async calls on the running event loop; a new pool is
+        opened if the loop changes (e.g. successive asyncio.run() calls),
+        and the previous one is released.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._release_async_client()
+            self._async_client = AsyncGroq(
+                api_key=self.api_key,
+                http_client=httpx.AsyncClient(
+                    http2=True,
+                    limits=_HTTP_LIMITS,
+                    timeout=_HTTP_TIMEOUT
+                )
+            )
+            self._async_loop = loop
+        return self._async_client
+    
+    def _release_async_client(self):
+        """
+        Drop the async client opened on a previous event loop.
+        
+        Its connections belong to that loop, so they are closed there while
+        it is still open; a closed loop can't run the close, and the pool's
+        sockets are freed when it is garbage-collected.
+        """
+        client, loop = self._async_client, self._async_loop
+        self._async_client = None
+        self._async_loop = None
+        if client is not None and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(client.close(), loop)
+    
+    @staticmethod
+    def _messages(prompt: str, system_prompt: str = None) -> tuple:
+        """Chat messages: static system prompt first, dynamic user prompt last."""
+        if system_prompt:
+            return (_system_message(system_prompt), {"role": "user", "content": prompt})
+        return ({"role": "user", "content": prompt},)
     
     def call_llm(
         self,
         prompt: str,
         temperature: float = 0.3,
         max_tokens: int = 1024,
-        model: str = None
+        model: str = None,
+        response_format: dict = None,
+        system_prompt: str = None
     ) -> str:
         """
         Call Groq LLM with a prompt.
@@ -53,6 +317,9 @@ class GroqLLMWrapper:
             temperature: Temperature for generation (0.1 = deterministic, 1.0 = creative)
             max_tokens: Maximum tokens to generate
             model: Model to use (defaults to primary model)
+            response_format: Optional output constraint, e.g. {"type": "json_object"}
+            system_prompt: Static instructions sent first as a system message,
+                so the provider can reuse the cached prefix across calls
         
         Returns:
             LLM response as string
@@ -61,32 +328,46 @@ class GroqLLMWrapper:
             Exception: If API call fails
         """
         try:
+            extra = {"response_format": response_format} if response_format else {}
             response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+                messages=self._messages(prompt, system_prompt),
                 model=model or self.model_primary,
                 temperature=temperature,
                 max_tokens=max_tokens,
+                **extra
             )
             
+            self._log_usage(response)
             result = response.choices[0].message.content
             return result
             
         except Exception as e:
-            print(f"❌ Error calling Groq LLM: {e}")
+            logger.error("❌ Error calling Groq LLM: %s", e)
             raise Exception(f"LLM API call failed: {str(e)}")
     
-    def extract_json(self, prompt: str, temperature: float = 0.1) -> dict:
+    def extract_json(
+        self,
+        prompt: str,
+        temperature: float = 0.1,
+        response_format: dict = None,
+        json_mode: bool = True,
+        max_tokens: int = 1024,
+        system_prompt: str = None
+    ) -> dict:
         """
         Call LLM and parse JSON response.
         
+        Successful results at temperature <= EXTRACT_MEMO_MAX_TEMPERATURE
+        are memoized in-process (LRU), so repeated prompts skip the API.
+        
         Args:
             prompt: The prompt to send (should ask for JSON output)
             temperature: Temperature (lower = more deterministic, better for extraction)
+            response_format: Optional output constraint, e.g. {"type": "json_object"}
+            json_mode: Constrain the output to a JSON object (the default).
+                With False the answer is free-form and parsed leniently
+            max_tokens: Maximum tokens to generate (keep small for short JSON answers)
+            system_prompt: Static instructions sent as a system message
         
         Returns:
             Parsed JSON as dictionary
@@ -94,51 +375,235 @@ class GroqLLMWrapper:
         Raises:
             Exception: If JSON parsing fails
         """
-        response = self.call_llm(prompt, temperature=temperature)
+        if json_mode and response_format is None:
+            response_format = _JSON_OBJECT_FORMAT
+        
+        memo_key = self._memo_key(prompt, temperature, max_tokens, response_format, system_prompt)
+        cached = self._memo_get(memo_key)
+        if cached is not None:
+            return cached
+        
+        response = self.call_llm(
+            prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=response_format,
+            system_prompt=system_prompt
+        )
+        
+        return self._memo_put(memo_key, self._parse_json(response))
+    
+    async def acall_llm(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 1024,
+        model: str = None,
+        response_format: dict = None,
+        system_prompt: str = None
+    ) -> str:
+        """
+        Async version of call_llm, sent over the shared HTTP/2 connection pool.
+        
+        Args:
+            prompt: The prompt to send to LLM
+            temperature: Temperature for generation
+            max_tokens: Maximum tokens to generate
+            model: Model to use (defaults to primary model)
+            response_format: Optional output constraint, e.g. {"type": "json_object"}
+            system_prompt: Static instructions sent first as a system message,
+                so the provider can reuse the cached prefix across calls
         
+        Returns:
+            LLM response as string
+        
+        Raises:
+            Exception: If API call fails
+        """
+        try:
+            extra = {"response_format": response_format} if response_format else {}
+            response = await self.async_client.chat.completions.create(
+                messages=self._messages(prompt, system_prompt),
+                model=model or self.model_primary,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **extra
+            )
+            self._log_usage(response)
+            return response.choices[0].message.content
+            
+        except Exception as e:
+            logger.error("❌ Error calling Groq LLM: %s", e)
+            raise Exception(f"LLM API call failed: {str(e)}")
+    
+    async def aextract_json(
+        self,
+        prompt: str,
+        temperature: float = 0.1,
+        response_format: dict = None,
+        json_mode: bool = True,
+        max_tokens: int = 1024,
+        system_prompt: str = None
+    ) -> dict:
+        """
+        Async version of extract_json (same arguments and parsing).
+        
+        Returns:
+            Parsed JSON as dictionary
+        """
+        if json_mode and response_format is None:
+            response_format = _JSON_OBJECT_FORMAT
+        
+        memo_key = self._memo_key(prompt, temperature, max_tokens, response_format, system_prompt)
+        cached = self._memo_get(memo_key)
+        if cached is not None:
+            return cached
+        
+        response = await self.acall_llm(
+            prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=response_format,
+            system_prompt=system_prompt
+        )
+        
+        return self._memo_put(memo_key, self._parse_json(response))
+    
+    async def abatch_extract_json(self, tasks: list, temperature: float = 0.1, max_tokens: int = 1024) -> list:
+        """
+        Answer several independent JSON prompts with a single LLM call.
+        
+        Sub-prompts are concatenated under "### TASK k" delimiters after a
+        static header (sent as the system prompt), and the model returns
+        one JSON object keyed "task_1" ... "task_n".
+        
+        Args:
+            tasks: List of {"name": str, "prompt": str} dicts, with an
+                optional "system" key holding the task's static instructions
+            temperature: Temperature for generation
+            max_tokens: Maximum tokens for the combined answer
+        
+        Returns:
+            One parsed dict per task, in order. A task missing from the
+            response gets {"error": ...}.
+        """
+        if not tasks:
+            return []
+        
+        parts = []
+        for k, task in enumerate(tasks, start=1):
+            parts.append(f"### TASK {k} ({task.get('name', 'task')})\n")
+            if task.get("system"):
+                parts.append(f"{task['system']}\n\n")
+            parts.append(f"{task['prompt']}\n\n")
+        
+        result = await self.aextract_json(
+            "".join(parts),
+            temperature=temperature,
+            json_mode=True,
+            max_tokens=max_tokens,
+            system_prompt=_BATCH_SYSTEM_PROMPT
+        )
+        if "error" in result:
+            return [dict(result) for _ in tasks]
+        
+        answers = []
+        for k in range(1, len(tasks) + 1):
+            answer = result.get(f"task_{k}")
+            answers.append(answer if isinstance(answer, dict) else {"error": f"Missing result for task {k}"})
+        return answers
+    
+    def _memo_key(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        response_format: dict,
+        system_prompt: str = None
+    ) -> Optional[bytes]:
+        """Memo key for a deterministic extraction, or None if it shouldn't be memoized."""
+        if temperature > EXTRACT_MEMO_MAX_TEMPERATURE:
+            return None
+        payload = orjson.dumps([self.model_primary, temperature, max_tokens, response_format, system_prompt, prompt])
+        return hashlib.blake2b(payload, digest_size=16).digest()
+    
+    def _memo_get(self, key: Optional[bytes]) -> Optional[dict]:
+        """Return a copy of a memoized extraction, or None on a miss."""
+        if key is None:
+            return None
+        with self._memo_lock:
+            cached = self._memo.get(key)
+            if cached is None:
+                return None
+            self._memo.move_to_end(key)
+        return copy.deepcopy(cached)  # Callers mutate their results
+    
+    def _memo_put(self, key: Optional[bytes], result: dict) -> dict:
+        """Memoize a successful extraction (LRU eviction) and return it."""
+        if key is not None and "error" not in result:
+            with self._memo_lock:
+                self._memo[key] = copy.deepcopy(result)
+                self._memo.move_to_end(key)
+                if len(self._memo) > EXTRACT_MEMO_SIZE:
+                    self._memo.popitem(last=False)
+        return result
+    
+    @staticmethod
+    def _log_usage(response):
+        """Log prompt tokens and how many came from the provider's prefix cache."""
+        usage = getattr(response, "usage", None)
+        if usage is None or not logger.isEnabledFor(logging.DEBUG):
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None) if details else getattr(usage, "prompt_tokens_cached", None)
+        logger.debug("📦 Prompt tokens: %s (cached: %s)", usage.prompt_tokens, cached or 0)
+    
+    @staticmethod
+    def _parse_json(response: str) -> dict:
+        """Parse JSON from an LLM response (plain, fenced or embedded)."""
         try:
             # Try to parse directly
-            return json.loads(response)
-        except json.JSONDecodeError:
-            # If response contains markdown code blocks, extract JSON from them
-            try:
-                # Look for JSON between ```json and ```
-                if '```json' in response:
-                    start = response.find('```json') + 7  # Length of ```json
-                    end = response.find('```', start)
-                    if end != -1:
-                        json_str = response[start:end].strip()
-                        return json.loads(json_str)
-                
-                # Look for JSON between ``` and ``` (without json marker)
-                if '```' in response:
-                    parts = response.split('```')
-                    for part in parts:
-                        part = part.strip()
-                        if part.startswith('{') and part.endswith('}'):
-                            try:
-                                return json.loads(part)
-                            except:
-                                continue
-                
-                # Find JSON between first { and last }
-                start = response.find('{')
-                end = response.rfind('}') + 1
-                
-                if start != -1 and end > start:
-                    json_str = response[start:end]
-                    return json.loads(json_str)
-                else:
-                    raise Exception("No JSON found in response")
-                    
-            except Exception as e:
-                print(f"❌ Failed to parse JSON from LLM response: {e}")
-                print(f"Raw response: {response}")
-                return {
-                    "error": "Failed to parse JSON",
-                    "raw_response": response
-                }
-
+            return orjson.loads(response)
+        except orjson.JSONDecodeError:
+            pass
+        
+        try:
+            # JSON inside a ```json / ``` code block (no backtick, no regex scan)
+            match = _FENCE_RE.search(response) if '`' in response else None
+            if match:
+                try:
+                    return orjson.loads(match.group(1))
+                except orjson.JSONDecodeError:
+                    pass
+            
+            # Otherwise decode the first { that starts a valid object,
+            # stopping at the end of that object
+            start = response.find('{')
+            while start != -1:
+                try:
+                    return _JSON_DECODER.raw_decode(response, start)[0]
+                except json.JSONDecodeError:
+                    start = response.find('{', start + 1)
+            raise ValueError("No JSON found in response")
+            
+        except ValueError as e:
+            logger.warning("❌ Failed to parse JSON from LLM response: %s", e)
+            logger.debug("Raw response: %s", response)
+            return {
+                "error": "Failed to parse JSON",
+                "raw_response": response
+            }
+    
+    def close(self):
+        """Close the sync HTTP connection pool."""
+        self._http.close()
+    
+    async def aclose(self):
+        """Close the shared async HTTP client (call on shutdown)."""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+            self._async_loop = None
     
     def test_connection(self) -> bool:
         """
@@ -153,12 +618,47 @@ class GroqLLMWrapper:
                 temperature=0.1,
                 max_tokens=10
             )
-            print(f"✅ Groq API test successful! Response: {response}")
+            logger.info("✅ Groq API test successful! Response: %s", response)
             return True
         except Exception as e:
-            print(f"❌ Groq API test failed: {e}")
+            logger.error("❌ Groq API test failed: %s", e)
             return False
 
 
-# Global instance (will be used by tools)
-llm = GroqLLMWrapper()
+# Global instance (will be used by tools), created on first use so that
+# importing this module doesn't build HTTP clients
+_llm: Optional[GroqLLMWrapper] = None
+_llm_lock = threading.Lock()
+
+
+def get_llm() -> GroqLLMWrapper:
+    """Return the shared GroqLLMWrapper, creating it on first call."""
+    global _llm
+    if _llm is None:
+        with _llm_lock:
+            if _llm is None:
+                _llm = GroqLLMWrapper()
+    return _llm
+
+
+# Identical prompts are answered from the response cache
+@cached_call(provider="groq", ttl_days=7)
+async def cached_aextract_json(prompt: str, **kwargs) -> dict:
+    """The shared wrapper's aextract_json behind the response cache."""
+    return await get_llm().aextract_json(prompt, **kwargs)
+
+
+async def aclose_llm():
+    """Close the shared wrapper's connection pools, if it was ever created."""
+    if _llm is not None:
+        await _llm.aclose()
+        _llm.close()
+
+
+def __getattr__(name: str):
+    # PEP 562: keeps `from app.utils.llm_utils import llm` working, lazily
+    if name == "llm":
+        return get_llm()
+    if name == "llm_cache":
+        return get_llm_cache()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,50 @@
+"""
+Shared pytest fixtures.
+
+Run the suite in parallel with:  pytest -n auto  (pytest-xdist)
+Session-scoped fixtures are created once per xdist worker.
+"""
+import httpx
+import pytest
+
+API_BASE_URL = "http://localhost:8000"
+GROQ_BASE_URL = "https://api.groq.com"
+
+
+@pytest.fixture(scope="session")
+def llm():
+    """The shared Groq wrapper; skips LLM-backed tests without an API key or network."""
+    from app.utils.llm_utils import get_llm
+
+    try:
+        wrapper = get_llm()
+    except ValueError as e:
+        pytest.skip(str(e))
+    try:
+        # Any HTTP response means the API is reachable
+        httpx.get(GROQ_BASE_URL, timeout=3.0)
+    except httpx.HTTPError:
+        pytest.skip(f"Groq API not reachable at {GROQ_BASE_URL}")
+    return wrapper
+
+
+@pytest.fixture
+def stub_llm(monkeypatch, tmp_path):
+    """Offline shared wrapper: tests replace its acall_llm; the response cache is a temp file."""
+    from app.utils import llm_utils
+
+    wrapper = llm_utils.GroqLLMWrapper(api_key="test")
+    monkeypatch.setattr(llm_utils, "_llm", wrapper)
+    monkeypatch.setattr(llm_utils, "_llm_cache", llm_utils.LLMCache(str(tmp_path / "llm_cache.db")))
+    yield wrapper
+    wrapper.close()
+
+
+@pytest.fixture(scope="session")
+def api_server():
+    """Base URL of a running backend; skips API tests when it isn't up."""
+    try:
+        httpx.get(f"{API_BASE_URL}/health", timeout=2.0).raise_for_status()
+    except httpx.HTTPError:
+        pytest.skip(f"Backend not running at {API_BASE_URL}")
+    return API_BASE_URL
@@ -1,73 +1,67 @@
-"""Test the complete LangGraph HCP Agent."""
-from app.agents.hcp_agent import agent
-import json
+"""Tests for the complete LangGraph HCP Agent (need GROQ_API_KEY)."""
+from app.agents.hcp_agent import get_agent
+import pytest
 
-print("\n" + "="*70)
-print("🧪 Testing LangGraph HCP Agent")
-print("="*70 + "\n")
 
-# Test 1: Log new interaction
-print("Test 1: Log New Interaction")
-print("-" * 70)
-result = agent.process(
-    user_input="Today I met with Dr. Smith and discussed product X efficiency. The sentiment was positive, and I shared the brochures.",
-    current_form_data=None
-)
-print(f"Intent detected: {result['intent']}")
-print(f"Form data: {json.dumps(result['form_data'], indent=2)}")
-print(f"Response: {result['chat_response']}")
-print(f"Status: {'✅ PASS' if result['success'] else '❌ FAIL'}\n")
+@pytest.fixture(scope="module")
+def agent(llm):
+    return get_agent()
 
-# Save data for next test
-saved_data = result['form_data']
 
-# Test 2: Edit interaction
-print("Test 2: Edit Existing Interaction")
-print("-" * 70)
-result = agent.process(
-    user_input="Actually, the sentiment was negative and the name was Dr. John Smith.",
-    current_form_data=saved_data
-)
-print(f"Intent detected: {result['intent']}")
-print(f"Updated HCP name: {result['form_data'].get('hcp_name')}")
-print(f"Updated sentiment: {result['form_data'].get('sentiment')}")
-print(f"Response: {result['chat_response']}")
-print(f"Status: {'✅ PASS' if result['success'] else '❌ FAIL'}\n")
+@pytest.fixture(scope="module")
+def saved_data(agent):
+    """Form data of a logged interaction, shared by the follow-up tests."""
+    result = agent.process(
+        user_input="Today I met with Dr. Smith and discussed product X efficiency. The sentiment was positive, and I shared the brochures.",
+        current_form_data=None
+    )
+    assert result['success'], result
+    return result['form_data']
 
-# Test 3: Schedule follow-up
-print("Test 3: Schedule Follow-up")
-print("-" * 70)
-result = agent.process(
-    user_input="Schedule a follow-up with this doctor next week to discuss trial results.",
-    current_form_data=saved_data
-)
-print(f"Intent detected: {result['intent']}")
-print(f"Follow-up date: {result['form_data'].get('follow_up_date')}")
-print(f"Response: {result['chat_response']}")
-print(f"Status: {'✅ PASS' if result['success'] else '❌ FAIL'}\n")
 
-# Test 4: Extract insights
-print("Test 4: Extract Insights")
-print("-" * 70)
-result = agent.process(
-    user_input="What are the opportunities from this interaction?",
-    current_form_data=saved_data
-)
-print(f"Intent detected: {result['intent']}")
-print(f"Response: {result['chat_response']}")
-print(f"Status: {'✅ PASS' if result['success'] else '❌ FAIL'}\n")
+def test_log_new_interaction(saved_data):
+    """Test 1: Log New Interaction"""
+    assert saved_data.get('hcp_name')
+    assert saved_data.get('sentiment') == 'Positive'
 
-# Test 5: Validate HCP
-print("Test 5: Validate HCP")
-print("-" * 70)
-result = agent.process(
-    user_input="Verify the HCP information is correct.",
-    current_form_data=saved_data
-)
-print(f"Intent detected: {result['intent']}")
-print(f"Response: {result['chat_response']}")
-print(f"Status: {'✅ PASS' if result['success'] else '❌ FAIL'}\n")
 
-print("="*70)
-print("✅ All Agent Tests Completed!")
-print("="*70 + "\n")
+def test_edit_existing_interaction(agent, saved_data):
+    """Test 2: Edit Existing Interaction"""
+    result = agent.process(
+        user_input="Actually, the sentiment was negative and the name was Dr. John Smith.",
+        current_form_data=dict(saved_data)
+    )
+    assert result['success'], result
+    assert result['intent'] == 'edit'
+    assert result['form_data'].get('sentiment') == 'Negative'
+
+
+def test_schedule_followup(agent, saved_data):
+    """Test 3: Schedule Follow-up"""
+    result = agent.process(
+        user_input="Schedule a follow-up with this doctor next week to discuss trial results.",
+        current_form_data=dict(saved_data)
+    )
+    assert result['success'], result
+    assert result['intent'] == 'schedule'
+    assert result['form_data'].get('follow_up_date')
+
+
+def test_extract_insights(agent, saved_data):
+    """Test 4: Extract Insights"""
+    result = agent.process(
+        user_input="What are the opportunities from this interaction?",
+        current_form_data=dict(saved_data)
+    )
+    assert result['success'], result
+    assert result['intent'] == 'insights'
+
+
+def test_validate_hcp(agent, saved_data):
+    """Test 5: Validate HCP"""
+    result = agent.process(
+        user_input="Verify the HCP information is correct.",
+        current_form_data=dict(saved_data)
+    )
+    assert result['success'], result
+    assert result['intent'] == 'validate'
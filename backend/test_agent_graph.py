@@ -0,0 +1,146 @@
+"""Offline tests for the agent graph (the LLM call is stubbed, no network)."""
+from types import SimpleNamespace
+import orjson
+import pytest
+from app.agents.hcp_agent import get_agent, _INTENT_RE, _FORMATTERS
+
+
+@pytest.fixture
+def llm_answers(stub_llm, monkeypatch):
+    """
+    Answer acall_llm by system prompt: tests fill in answers with
+    {system prompt fragment: JSON answer}; every call is recorded in calls.
+    """
+    answers = {}
+    calls = []
+
+    async def acall_llm(prompt, system_prompt=None, **kwargs):
+        calls.append(system_prompt)
+        for fragment, answer in answers.items():
+            if fragment in (system_prompt or ""):
+                return orjson.dumps(answer).decode()
+        raise AssertionError(f"Unexpected LLM call: {system_prompt!r}")
+
+    monkeypatch.setattr(stub_llm, "acall_llm", acall_llm)
+    return SimpleNamespace(answers=answers, calls=calls)
+
+
+ROUTER = "medical sales CRM"
+BATCH = "several independent tasks"
+VALIDATE = "healthcare database expert"
+
+
+@pytest.mark.parametrize("label, intent", [
+    ("log", "log"),
+    ("Edit", "edit"),
+    ("update", "edit"),
+    ("follow-up", "schedule"),
+    ("analyze", "insights"),
+    ("opportunities", "insights"),
+    ("verify", "validate"),
+    ("the intent is: validate", "validate"),
+])
+def test_intent_regex(label, intent):
+    assert _INTENT_RE.search(label.lower()).lastgroup == intent
+
+
+def test_log_uses_the_router_extraction(llm_answers):
+    llm_answers.answers[ROUTER] = {"intent": "log", "extraction": {
+        "hcp_name": "Dr. Anita Rao", "date": "2026-01-17", "sentiment": "Positive",
+        "materials_shared": ["samples"], "discussion_summary": "CardioPlus trial data",
+        "products_discussed": ["CardioPlus"]
+    }}
+
+    result = get_agent().process("Met Dr. Anita Rao yesterday about CardioPlus, left samples.")
+
+    assert result["success"], result
+    assert result["intent"] == "log"
+    assert result["form_data"]["hcp_name"] == "Dr. Anita Rao"
+    assert result["form_data"]["products_discussed"] == ["CardioPlus"]
+    assert "Dr. Anita Rao" in result["chat_response"]
+    assert len(llm_answers.calls) == 1  # No second extraction call
+
+
+@pytest.mark.parametrize("label, current, intent", [
+    ("???", None, "log"),
+    ("???", {"hcp_name": "Dr. Okafor", "sentiment": "Neutral"}, "edit"),
+])
+def test_unknown_intent_falls_back(llm_answers, label, current, intent):
+    llm_answers.answers[ROUTER] = {"intent": label, "extraction": {"sentiment": "Negative"}}
+
+    result = get_agent().process("Hmm, about that meeting.", current)
+
+    assert result["intent"] == intent
+
+
+def test_edit_merges_changes(llm_answers):
+    llm_answers.answers[ROUTER] = {"intent": "edit", "extraction": {"sentiment": "Negative"}}
+    current = {"hcp_name": "Dr. Okafor", "sentiment": "Positive", "materials_shared": ["brochure"]}
+
+    result = get_agent().process("Actually it went badly.", dict(current))
+
+    assert result["success"], result
+    assert result["form_data"]["sentiment"] == "Negative"
+    assert result["form_data"]["materials_shared"] == ["brochure"]
+
+
+def test_insights_report_validation_without_renaming(llm_answers):
+    llm_answers.answers[ROUTER] = {"intent": "insights", "extraction": {}}
+    llm_answers.answers[BATCH] = {
+        "task_1": {"opportunities": ["Pilot program"], "concerns": [], "recommended_actions": ["Send pricing"],
+                   "priority_level": "High"},
+        "task_2": {"is_valid": True, "formatted_name": "Dr. Priya Nair", "likely_specialty": "Oncology"}
+    }
+    current = {"hcp_name": "dr priya nair", "sentiment": "Positive", "discussion_summary": "Asked about pricing"}
+
+    result = get_agent().process("What are the opportunities?", current)
+
+    assert result["success"], result
+    assert result["form_data"]["hcp_name"] == "dr priya nair"
+    assert "Pilot program" in result["form_data"]["key_insights"]
+    assert "HCP check: Dr. Priya Nair (Oncology)" in result["chat_response"]
+
+
+def test_validate_renames(llm_answers):
+    llm_answers.answers[ROUTER] = {"intent": "validate", "extraction": {}}
+    llm_answers.answers[VALIDATE] = {"is_valid": True, "formatted_name": "Dr. Wei Chen", "likely_specialty": "Cardiology"}
+
+    result = get_agent().process("Check the doctor's name.", {"hcp_name": "dr wei chen"})
+
+    assert result["success"], result
+    assert result["form_data"]["hcp_name"] == "Dr. Wei Chen"
+
+
+def test_schedule_fast_path_makes_no_tool_call(llm_answers):
+    llm_answers.answers[ROUTER] = {"intent": "schedule", "extraction": {}}
+
+    result = get_agent().process("Schedule a follow-up next week to discuss pricing", {"hcp_name": "Dr. Rao"})
+
+    assert result["success"], result
+    assert result["form_data"]["follow_up_date"]
+    assert result["form_data"]["hcp_name"] == "Dr. Rao"
+    assert len(llm_answers.calls) == 1  # Only the router
+
+
+def test_formatters():
+    form_data = {"hcp_name": "Dr. Rao", "date": "2026-01-18", "sentiment": "Positive",
+                 "materials_shared": ["samples"], "products_discussed": []}
+
+    log = _FORMATTERS["log"](form_data, {})
+    assert "Dr. Rao" in log and "- Materials: samples" in log and "Products" not in log
+
+    schedule = _FORMATTERS["schedule"](form_data, {
+        "follow_up_date": "2026-01-25", "talking_points": ["Pricing"], "preparation_notes": "Bring data"
+    })
+    assert schedule.startswith("✓ Follow-up scheduled for 2026-01-25!")
+    assert "  • Pricing\n" in schedule and schedule.endswith("📌 Preparation: Bring data")
+
+    insights = _FORMATTERS["insights"](form_data, {"priority_level": "Low", "validation": {
+        "success": False, "error": "Failed to parse JSON", "formatted_name": "Dr. Rao"
+    }})
+    assert "Priority: Low" in insights and "HCP check" not in insights
+
+    validate = _FORMATTERS["validate"](form_data, {
+        "formatted_name": "Dr. Rao", "likely_specialty": "Oncology", "requires_verification": True
+    })
+    assert "Oncology" in validate and "Manual verification recommended" in validate
@@ -1,120 +1,104 @@
-"""Test all API endpoints."""
-import requests
-import json
-
-BASE_URL = "http://localhost:8000/api"
-
-print("\n" + "="*70)
-print("🧪 Testing FastAPI Endpoints")
-print("="*70 + "\n")
-
-# Test 1: Chat endpoint (new interaction)
-print("Test 1: POST /api/chat (New Interaction)")
-print("-" * 70)
-response = requests.post(
-    f"{BASE_URL}/chat",
-    json={
-        "message": "Today I met with Dr. Johnson and discussed diabetes medication. Sentiment was positive, shared clinical data."
-    }
-)
-print(f"Status: {response.status_code}")
-data = response.json()
-print(f"Form data: {json.dumps(data['form_data'], indent=2)}")
-print(f"Response: {data['chat_response'][:100]}...")
-print(f"Status: {'✅ PASS' if response.status_code == 200 else '❌ FAIL'}\n")
-
-# Save form data for creating interaction
-form_data = data['form_data']
-
-# Test 2: Create interaction
-print("Test 2: POST /api/interactions (Create)")
-print("-" * 70)
-response = requests.post(
-    f"{BASE_URL}/interactions",
-    json={
-        "hcp_name": form_data.get("hcp_name"),
-        "date": form_data.get("date"),
-        "sentiment": form_data.get("sentiment", "Neutral"),
-        "materials_shared": form_data.get("materials_shared", []),
-        "discussion_summary": form_data.get("discussion_summary"),
-        "products_discussed": form_data.get("products_discussed", [])
-    }
-)
-print(f"Status: {response.status_code}")
-if response.status_code == 201:
+"""Tests for all API endpoints (need the backend running on localhost:8000)."""
+import asyncio
+import httpx
+
+# One pooled client for the whole run (connections are reused);
+# failed connection attempts are retried twice
+LIMITS = httpx.Limits(max_connections=16, max_keepalive_connections=16)
+RETRIES = 2
+TIMEOUT = httpx.Timeout(60.0)
+
+
+async def check_chat_new(client: httpx.AsyncClient) -> dict:
+    """Test 1: chat endpoint (new interaction). Returns the form data."""
+    response = await client.post(
+        "/chat",
+        json={
+            "message": "Today I met with Dr. Johnson and discussed diabetes medication. Sentiment was positive, shared clinical data."
+        }
+    )
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data['chat_response']
+    return data['form_data']
+
+
+async def check_create(client: httpx.AsyncClient, form_data: dict) -> int:
+    """Test 2: create interaction. Returns the new id."""
+    response = await client.post(
+        "/interactions",
+        json={
+            "hcp_name": form_data.get("hcp_name"),
+            "date": form_data.get("date"),
+            "sentiment": form_data.get("sentiment", "Neutral"),
+            "materials_shared": form_data.get("materials_shared", []),
+            "discussion_summary": form_data.get("discussion_summary"),
+            "products_discussed": form_data.get("products_discussed", [])
+        }
+    )
+    assert response.status_code == 201, response.text
     interaction = response.json()
-    interaction_id = interaction['id']
-    print(f"Created interaction ID: {interaction_id}")
-    print(f"HCP: {interaction['hcp_name']}")
-    print(f"Status: ✅ PASS\n")
-else:
-    print(f"Error: {response.text}")
-    print(f"Status: ❌ FAIL\n")
-    interaction_id = None
-
-# Test 3: Get interaction
-if interaction_id:
-    print("Test 3: GET /api/interactions/{id} (Read)")
-    print("-" * 70)
-    response = requests.get(f"{BASE_URL}/interactions/{interaction_id}")
-    print(f"Status: {response.status_code}")
-    if response.status_code == 200:
-        data = response.json()
-        print(f"Retrieved: {data['hcp_name']}")
-        print(f"Status: ✅ PASS\n")
-    else:
-        print(f"Status: ❌ FAIL\n")
-
-# Test 4: Chat with edit
-if interaction_id:
-    print("Test 4: POST /api/chat (Edit Existing)")
-    print("-" * 70)
-    response = requests.post(
-        f"{BASE_URL}/chat",
+    assert interaction['hcp_name'] == form_data.get("hcp_name")
+    return interaction['id']
+
+
+async def check_get(client: httpx.AsyncClient, interaction_id: int):
+    """Test 3: get interaction."""
+    response = await client.get(f"/interactions/{interaction_id}")
+    assert response.status_code == 200, response.text
+    assert response.json()['id'] == interaction_id
+
+
+async def check_chat_edit(client: httpx.AsyncClient, interaction_id: int):
+    """Test 4: chat with edit."""
+    response = await client.post(
+        "/chat",
         json={
             "message": "Actually, the sentiment was negative",
             "interaction_id": interaction_id
         }
     )
-    print(f"Status: {response.status_code}")
-    if response.status_code == 200:
-        data = response.json()
-        print(f"Updated sentiment: {data['form_data'].get('sentiment')}")
-        print(f"Response: {data['chat_response'][:100]}...")
-        print(f"Status: ✅ PASS\n")
-    else:
-        print(f"Status: ❌ FAIL\n")
-
-# Test 5: Update interaction
-if interaction_id:
-    print("Test 5: PATCH /api/interactions/{id} (Update)")
-    print("-" * 70)
-    response = requests.patch(
-        f"{BASE_URL}/interactions/{interaction_id}",
+    assert response.status_code == 200, response.text
+    assert response.json()['form_data'].get('sentiment') == 'Negative'
+
+
+async def check_update(client: httpx.AsyncClient, interaction_id: int):
+    """Test 5: update interaction."""
+    response = await client.patch(
+        f"/interactions/{interaction_id}",
         json={"sentiment": "Positive"}
     )
-    print(f"Status: {response.status_code}")
-    if response.status_code == 200:
-        data = response.json()
-        print(f"Updated sentiment: {data['sentiment']}")
-        print(f"Status: ✅ PASS\n")
-    else:
-        print(f"Status: ❌ FAIL\n")
-
-# Test 6: List interactions
-print("Test 6: GET /api/interactions (List)")
-print("-" * 70)
-response = requests.get(f"{BASE_URL}/interactions")
-print(f"Status: {response.status_code}")
-if response.status_code == 200:
+    assert response.status_code == 200, response.text
+    assert response.json()['sentiment'] == 'Positive'
+
+
+async def check_list(client: httpx.AsyncClient):
+    """Test 6: list interactions."""
+    response = await client.get("/interactions")
+    assert response.status_code == 200, response.text
     data = response.json()
-    print(f"Total interactions: {len(data)}")
-    if data:
-        print(f"First interaction: {data[0]['hcp_name']}")
-    print(f"Status: ✅ PASS\n")
-else:
-    print(f"Status: ❌ FAIL\n")
-
-print("="*70)
-print("✅ All API Tests Completed!")
-print("="*70 + "\n")
+    assert isinstance(data["items"], list)
+    assert "next_cursor" in data
+
+
+async def check_interaction_flow(client: httpx.AsyncClient):
+    """Tests 1-5: each step depends on the previous one, so they run in order."""
+    form_data = await check_chat_new(client)
+    interaction_id = await check_create(client, form_data)
+    await check_get(client, interaction_id)
+    await check_chat_edit(client, interaction_id)
+    await check_update(client, interaction_id)
+
+
+async def run_checks(base_url: str):
+    transport = httpx.AsyncHTTPTransport(limits=LIMITS, retries=RETRIES)
+    async with httpx.AsyncClient(base_url=f"{base_url}/api", transport=transport, timeout=TIMEOUT) as client:
+        # The listing is independent of the create/edit flow
+        await asyncio.gather(
+            check_interaction_flow(client),
+            check_list(client)
+        )
+
+
+def test_api_endpoints(api_server):
+    asyncio.run(run_checks(api_server))
@@ -0,0 +1,117 @@
+"""Offline tests for the LLM utilities (no API calls)."""
+import asyncio
+import pytest
+from app.utils import llm_utils
+from app.utils.llm_utils import GroqLLMWrapper, LLMCache, cached_call
+
+
+@pytest.mark.parametrize("response, expected", [
+    ('{"hcp_name": "Dr. Smith"}', {"hcp_name": "Dr. Smith"}),
+    ('Here you go:\n```json\n{"sentiment": "Positive"}\n```\nAnything else?', {"sentiment": "Positive"}),
+    ('```\n{"a": 1}\n```', {"a": 1}),
+    # A stray brace in the prose before the object: decoding retries at the next '{'
+    ('Result {see below}: {"a": {"b": [1, 2]}} trailing text', {"a": {"b": [1, 2]}}),
+])
+def test_parse_json(response, expected):
+    assert GroqLLMWrapper._parse_json(response) == expected
+
+
+@pytest.mark.parametrize("response", ["No JSON here", "{not json}", ""])
+def test_parse_json_without_json(response):
+    result = GroqLLMWrapper._parse_json(response)
+    assert result["error"] == "Failed to parse JSON"
+    assert result["raw_response"] == response
+
+
+def test_llm_cache_round_trip_and_stats(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.db"))
+    key = LLMCache.make_key("groq", "model", "prompt", 0, 128)
+
+    assert cache.get(key) is None
+    cache.set(key, {"a": 1}, tokens=42, ttl_days=1)
+    assert cache.get(key) == {"a": 1}
+    assert cache.stats() == {"hits": 1, "misses": 1, "tokens_saved": 42}
+
+
+def test_llm_cache_expiry(tmp_path, monkeypatch):
+    cache = LLMCache(str(tmp_path / "cache.db"))
+    now = [1_000_000.0]
+    monkeypatch.setattr(llm_utils.time, "time", lambda: now[0])
+
+    cache.set("key", {"a": 1}, tokens=1, ttl_days=1)
+    now[0] += 86400 - 1
+    assert cache.get("key") == {"a": 1}
+    now[0] += 2
+    assert cache.get("key") is None
+    # The expired row was deleted, not just skipped
+    now[0] = 0
+    assert cache.get("key") is None
+
+
+def test_llm_cache_disabled(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.db"), enabled=False)
+    cache.set("key", {"a": 1}, tokens=1, ttl_days=1)
+    assert cache.get("key") is None
+    assert not (tmp_path / "cache.db").exists()
+
+
+def test_make_key_normalizes_unicode():
+    composed = LLMCache.make_key("groq", "model", "caf\u00e9", 0, None)
+    decomposed = LLMCache.make_key("groq", "model", "cafe\u0301", 0, None)
+    assert composed == decomposed
+    assert composed != LLMCache.make_key("groq", "model", "café", 0.1, None)
+
+
+def test_cached_call_skips_errors(stub_llm):
+    calls = []
+
+    @cached_call(ttl_days=1)
+    async def extract(prompt: str, **kwargs) -> dict:
+        calls.append(prompt)
+        return {"error": "boom"} if prompt == "bad" else {"prompt": prompt}
+
+    async def run():
+        return [await extract(prompt, temperature=0) for prompt in ("good", "good", "bad", "bad")]
+
+    assert asyncio.run(run()) == [{"prompt": "good"}] * 2 + [{"error": "boom"}] * 2
+    assert calls == ["good", "bad", "bad"]
+
+
+def test_extract_memo_returns_copies(stub_llm, monkeypatch):
+    calls = []
+
+    async def acall_llm(prompt, **kwargs):
+        calls.append(prompt)
+        return '{"materials_shared": ["brochure"]}'
+
+    monkeypatch.setattr(stub_llm, "acall_llm", acall_llm)
+
+    first = asyncio.run(stub_llm.aextract_json("prompt", temperature=0))
+    first["materials_shared"].append("samples")
+    second = asyncio.run(stub_llm.aextract_json("prompt", temperature=0))
+
+    assert second == {"materials_shared": ["brochure"]}
+    assert calls == ["prompt"]
+
+
+def test_extract_memo_is_lru_and_skips_high_temperature(stub_llm, monkeypatch):
+    calls = []
+
+    async def acall_llm(prompt, **kwargs):
+        calls.append(prompt)
+        return '{"ok": true}'
+
+    monkeypatch.setattr(stub_llm, "acall_llm", acall_llm)
+    monkeypatch.setattr(llm_utils, "EXTRACT_MEMO_SIZE", 2)
+
+    async def run(*prompts, temperature=0):
+        for prompt in prompts:
+            await stub_llm.aextract_json(prompt, temperature=temperature)
+
+    asyncio.run(run("a", "b", "a", "c"))  # "b" is least recently used when "c" is added
+    assert calls == ["a", "b", "c"]
+    asyncio.run(run("a", "b"))
+    assert calls == ["a", "b", "c", "b"]
+
+    asyncio.run(run("d", "d", temperature=0.7))
+    assert calls.count("d") == 2
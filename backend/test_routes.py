@@ -0,0 +1,95 @@
+"""Offline tests for the interaction routes (in-memory SQLite, no server)."""
+import asyncio
+from datetime import date, datetime
+import orjson
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app.database.db import Base
+from app.routes.chat import _insert_interactions, list_interactions
+from app.schemas.interaction_schema import InteractionCreate
+
+
+async def _with_session(check):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            return await check(db)
+    finally:
+        await engine.dispose()
+
+
+def run_with_session(check):
+    return asyncio.run(_with_session(check))
+
+
+def _interactions(count: int) -> list:
+    return [InteractionCreate(hcp_name=f"Dr. {i}", date=date(2026, 1, 18)) for i in range(count)]
+
+
+async def _list_page(db, limit: int, cursor: dict = None) -> dict:
+    cursor = cursor or {}
+    before_created_at = cursor.get("before_created_at")
+    response = await list_interactions(
+        before_created_at=datetime.fromisoformat(before_created_at) if before_created_at else None,
+        before_id=cursor.get("before_id"),
+        limit=limit,
+        db=db
+    )
+    return orjson.loads(response.body)
+
+
+def test_bulk_insert_keeps_input_order():
+    async def check(db):
+        created = await _insert_interactions(db, _interactions(25))
+        assert [row.hcp_name for row in created] == [f"Dr. {i}" for i in range(25)]
+        assert [row.id for row in created] == sorted(row.id for row in created)
+
+    run_with_session(check)
+
+
+@pytest.mark.parametrize("limit", [1, 3, 4, 10])
+def test_cursor_walk_has_no_duplicates_or_gaps(limit):
+    async def check(db):
+        created = await _insert_interactions(db, _interactions(10))
+        # Two groups of rows sharing a created_at, so ties are broken by id
+        for rows, created_at in (
+            (created[:4], "2026-01-17 09:00:00"),
+            (created[4:], "2026-01-18 09:00:00")
+        ):
+            for row in rows:
+                await db.execute(
+                    text("UPDATE interactions SET created_at = :created_at WHERE id = :id"),
+                    {"created_at": created_at, "id": row.id}
+                )
+        await db.commit()
+
+        seen = []
+        page = await _list_page(db, limit)
+        while True:
+            seen.extend(item["id"] for item in page["items"])
+            if page["next_cursor"] is None:
+                break
+            page = await _list_page(db, limit, page["next_cursor"])
+
+        ids = [row.id for row in created]
+        expected = sorted(ids[4:], reverse=True) + sorted(ids[:4], reverse=True)
+        assert seen == expected
+
+    run_with_session(check)
+
+
+@pytest.mark.parametrize("cursor", [
+    {"before_created_at": datetime(2026, 1, 18, 9, 0)},
+    {"before_id": 3},
+])
+def test_half_cursor_rejected(cursor):
+    async def check(db):
+        with pytest.raises(HTTPException) as exc_info:
+            await list_interactions(**cursor, limit=10, db=db)
+        assert exc_info.value.status_code == 422
+
+    run_with_session(check)
@@ -0,0 +1,64 @@
+"""Offline tests for the follow-up date parsing (no LLM calls)."""
+from datetime import datetime
+import pytest
+from app.agents.tools.schedule_followup import (
+    fastpath_followup,
+    resolve_relative_date,
+    first_relative_date
+)
+
+# A Thursday
+NOW = datetime(2026, 10, 15, 9, 30)
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("Schedule a follow-up next week", "2026-10-22"),
+    ("Schedule a follow-up with Dr. Rao tomorrow", "2026-10-16"),
+    ("Schedule a follow-up with Dr. Rao the day after tomorrow", "2026-10-17"),
+    ("Schedule a follow-up with Dr. Rao day after tomorrow", "2026-10-17"),
+    ("Book a meeting with dr meera mehta in 3 days to discuss pricing.", "2026-10-18"),
+    ("set up a followup next friday to go over the trial results", "2026-10-16"),
+    ("Schedule a follow-up with Dr. Rao next month", "2026-11-14"),
+])
+def test_fastpath_dates(message, expected):
+    result = fastpath_followup("Dr. Rao", message, now=NOW)
+    assert result["follow_up_date"] == expected
+    assert result["source"] == "fastpath"
+
+
+@pytest.mark.parametrize("message", [
+    "Schedule a follow-up with Dr. Rao on the friday after next week",
+    "Schedule a follow-up next month, not tomorrow",
+    "Schedule a follow-up next week to discuss pricing, or maybe tomorrow",
+    "Schedule a follow-up sometime after the conference",
+])
+def test_fastpath_leaves_unclear_requests_to_the_llm(message):
+    assert fastpath_followup("Dr. Rao", message, now=NOW) is None
+
+
+def test_fastpath_topic():
+    result = fastpath_followup("Dr. Rao", "Schedule a follow-up next week to discuss trial results.", now=NOW)
+    assert result["talking_points"][0] == "Discuss trial results"
+    assert result["preparation_notes"] == "Prepare materials on trial results"
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("Can you book a follow-up next friday?", "2026-10-16"),
+    ("Please schedule it the day after tomorrow", "2026-10-17"),
+    ("Plan a visit in 2 weeks", "2026-10-29"),
+    ("She is busy tomorrow, book it for March 3rd", None),
+    ("Tomorrow I will call her", None),
+])
+def test_resolve_relative_date(message, expected):
+    assert resolve_relative_date(message, now=NOW) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("today", "2026-10-15"),
+    ("busy tomorrow, then next monday", "2026-10-16"),
+    ("next thursday", "2026-10-22"),
+    ("in 1 week", "2026-10-22"),
+    ("sometime soon", None),
+])
+def test_first_relative_date(text, expected):
+    assert first_relative_date(text, now=NOW) == expected
@@ -60,11 +60,15 @@ export const updateInteraction = async (id, updateData) => {
 };
 
 /**
- * List all interactions.
- * @returns {Promise} Array of interactions
+ * List interactions, newest first, one page at a time.
+ * @param {object} [cursor] - next_cursor from the previous page
+ * @param {number} [limit] - Page size
+ * @returns {Promise} { items, next_cursor } (next_cursor is null on the last page)
  */
-export const listInteractions = async () => {
-  const response = await apiClient.get('/interactions');
+export const listInteractions = async (cursor = null, limit = 100) => {
+  const response = await apiClient.get('/interactions', {
+    params: { ...(cursor || {}), limit },
+  });
   return response.data;
 };
 